@@ -1,35 +1,153 @@
-from flask import Flask, jsonify, request, Response, json, send_from_directory
-import os, random
+from flask import Flask, jsonify, request, Response, json, stream_with_context
+import os
 from datetime import datetime
+from datastore import DataStore
+from search_index import search_positions
+from facets import build_facet_index
+from ordering import parse_page_params, ordered_ranks, paginate_ranks, iter_ranks, next_rank_cursor
+from response_cache import ResponseCache
+from query_cache import QueryCache
+from user_store import UserRepository, NicknameTaken
+from question_store import QuestionRepository
+from metrics import Metrics
+from snapshot import Snapshot
+from assets import LogoAssets
+from search_trends import SearchTrends
+from recommend import build_type_pools, parse_sample_params, sample
 
 app = Flask(__name__)
 
 # 애플리케이션의 루트 디렉토리 기반으로 절대 경로 생성
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 벤치마크 등에서 다른 데이터 폴더를 쓸 수 있도록 환경 변수로 바꿀 수 있게 함
+DATA_DIR = os.environ.get('SB_DATA_DIR', os.path.join(BASE_DIR, 'data'))
+QA_DIR = os.environ.get('SB_QA_DIR', os.path.join(BASE_DIR, 'Q&A'))
 
 # 'school_link.json' 파일에서 데이터 불러오기
-school_link_path = os.path.join(BASE_DIR, 'data', 'school_link.json')
+school_link_path = os.path.join(DATA_DIR, 'school_link.json')
 with open(school_link_path, 'r', encoding='utf-8') as file:
     school_data = json.load(file)
 
-# 'outschool_gara.json' 파일에서 데이터 불러오기
-outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-    outschool_data = json.load(file)
+# data/ 아래 JSON 파일은 한 번만 읽고, 파일이 바뀌었을 때만 다시 읽는다
+# (인기 검색어 파일은 search_trends 가 주기적으로 다시 쓰므로 미리 읽지 않고 워커가 필요할 때 읽는다.
+#  미리 읽는 파일이 바뀌면 serve.py 마스터가 워커를 모두 교체하기 때문)
+PRELOAD_PATTERNS = [
+    ('outschool_gara.json',),
+    ('oncampus_data', 'system', '*'),
+    ('oncampus_data', 'class', '*'),
+    ('oncampus_data', 'notify', '*'),
+    ('oncampus_data', 'support_group', '*'),
+]
+# `python snapshot.py build` 로 만든 스냅샷이 있으면 JSON 파싱 대신 사용 (원본이 바뀐 파일은 JSON 으로 읽음)
+SNAPSHOT_PATH = os.environ.get('SB_SNAPSHOT', os.path.join(DATA_DIR, 'snapshot.bin'))
+store = DataStore(DATA_DIR, snapshot=Snapshot.open_if_exists(SNAPSHOT_PATH, DATA_DIR))
+
+# 라우트별 지연시간/응답 크기, 처리 단계별 시간, 캐시 hit/miss 를 /metrics 로 노출
+metrics = Metrics()
+metrics.init_app(app, store)
+
+store.preload(PRELOAD_PATTERNS)
+
+# 전체 목록 응답은 직렬화/압축한 바이트를 데이터 버전별로 캐시한다
+response_cache = ResponseCache()
+metrics.register_cache('response', response_cache)
+
+# 같은 조건의 필터/검색 결과는 잠시 캐시하고, 동시에 들어온 같은 요청은 한 번만 계산한다
+query_cache = QueryCache()
+metrics.register_cache('query', query_cache)
+
+# 학교 로고는 시작할 때 모두 읽어서 최소화/압축본과 함께 메모리에서 바로 응답
+logo_assets = LogoAssets(os.path.join(DATA_DIR, 'school_logo'))
+
+# 실제 검색어를 모아서 주기적으로 인기 검색어 파일을 갱신 (SB_TRENDS_INTERVAL=0 이면 끔)
+search_trends = SearchTrends(DATA_DIR, interval=int(os.environ.get('SB_TRENDS_INTERVAL', 300)))
+
+# 사용자 정보는 SQLite 에 저장 (처음 실행 시 기존 user_info.json 을 옮겨온다)
+user_repository = UserRepository(
+    os.path.join(DATA_DIR, 'system_data', 'user_info.db'),
+    legacy_json_path=os.path.join(DATA_DIR, 'system_data', 'user_info.json'))
+
+# Q&A 질문도 SQLite 에 추가만 하는 방식으로 저장 (기존 {공고id}q.json 파일은 처음 한 번 옮겨온다)
+question_repository = QuestionRepository(
+    os.path.join(QA_DIR, 'question_data.db'),
+    legacy_dir=os.path.join(QA_DIR, 'question_data'))
+
+def list_response(items, limit=None, next_cursor=None, **extra):
+    # limit 을 보내지 않은 기존 요청은 리스트 그대로, 아니면 페이지 정보를 함께 반환
+    with metrics.span('serialize'):
+        if limit is None and not extra:
+            return jsonify(items)
+        body = {"items": items}
+        if limit is not None:
+            body["nextCursor"] = next_cursor
+        body.update(extra)
+        return jsonify(body)
+
+def cached_ranks(key, dataset, sorting, find_positions):
+    # key: 정규화한 요청 조건. 데이터 버전과 정렬 조건을 붙여 캐시 키로 쓴다
+    def compute():
+        positions = find_positions()
+        with metrics.span('sort'):
+            return ordered_ranks(dataset, positions, sorting)
+    return query_cache.get(key + (sorting, dataset.version), compute)
+
+def normalize_keyword(keyword):
+    # 검색은 대소문자를 구분하지 않으므로 캐시 키도 소문자로 맞춘다
+    return keyword.lower() if isinstance(keyword, str) else keyword
+
+def wants_ndjson():
+    # Accept: application/x-ndjson 이나 ?stream=1 이면 항목을 한 줄씩 스트리밍
+    if request.args.get('stream') == '1':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def ndjson_response(items, trailer=None):
+    # items 는 generator: 조건에 맞는 항목을 찾는 대로 한 줄씩 내보낸다
+    # trailer 가 있으면 ({"facets": ...} 등) 항목 뒤에 마지막 줄로 붙인다
+    def generate():
+        for item in items:
+            yield json.dumps(item, ensure_ascii=False) + '\n'
+        if trailer is not None:
+            yield json.dumps(trailer, ensure_ascii=False) + '\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson; charset=utf-8')
+
+def ndjson_page(dataset, ranks, sorting=None, limit=None, cursor=None, **extra):
+    # 한 페이지를 스트리밍. limit 이 있으면 JSON 응답과 같이 nextCursor 를 마지막 줄에 붙인다
+    trailer = dict(extra)
+    if limit is not None:
+        trailer["nextCursor"] = next_rank_cursor(ranks, limit, cursor)
+    return ndjson_response(iter_ranks(dataset, ranks, sorting, limit, cursor), trailer or None)
 
 @app.route('/<int:no>/logo', methods=['GET'])
 def get_school_logo(no):
-    logo_path = os.path.join(BASE_DIR, 'data', 'school_logo', f'{no}.svg')
-    if os.path.exists(logo_path):
-        return send_from_directory(os.path.join(BASE_DIR, 'data', 'school_logo'), f'{no}.svg')
+    response = logo_assets.response(no, request.args.get('v'))
+    if response is not None:
+        return response
     else:
         return "Logo not found for the provided number", 404
 
+# 모든 로고(또는 ?nos=1,2,3 로 지정한 로고)를 JSON 하나로 반환
+@app.route('/logos/bundle', methods=['GET'])
+def get_school_logo_bundle():
+    nos = request.args.get('nos')
+    if nos:
+        try:
+            nos = [int(no) for no in nos.split(',')]
+        except ValueError:
+            return jsonify({"error": "nos must be a comma separated list of numbers"}), 400
+    return logo_assets.bundle_response(nos or None)
+
+# 로고별 내용 해시: /<no>/logo?v=<해시> 로 요청하면 오래 캐시할 수 있다
+@app.route('/logos/versions', methods=['GET'])
+def get_school_logo_versions():
+    return jsonify({str(no): etag for no, etag in logo_assets.versions().items()})
+
 @app.route('/<int:no>/system', methods=['GET'])
 def get_system_data(no):
-    system_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'system', f'{no}.json')
-    if os.path.exists(system_path):
-        return send_from_directory(os.path.join(BASE_DIR, 'data', 'oncampus_data', 'system'), f'{no}.json', mimetype='application/json; charset=utf-8')
+    system_dataset = store.get('oncampus_data', 'system', f'{no}.json')
+    if system_dataset is not None:
+        # 파일 내용을 그대로 내려주되, 압축본과 ETag 를 캐시해서 사용
+        return response_cache.response(('system', no), system_dataset.version, system_dataset.read_bytes)
     else:
         return "System data not found for the provided number", 404
 
@@ -39,20 +157,19 @@ def get_system_data_by_ids(no):
     if not requested_ids:
         return jsonify({"error": "No IDs provided"}), 400
 
-    system_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'system', f'{no}.json')
-    if os.path.exists(system_path):
-        with open(system_path, 'r', encoding='utf-8') as file:
-            system_data = json.load(file)
-        filtered_data = [item for item in system_data if item.get('id') in requested_ids]
+    system_dataset = store.get('oncampus_data', 'system', f'{no}.json')
+    if system_dataset is not None:
+        filtered_data = system_dataset.find_by_ids(requested_ids)
         return jsonify(filtered_data)
     else:
         return "System data not found for the provided number", 404
 
 @app.route('/<int:no>/class', methods=['GET'])
 def get_class_data(no):
-    class_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'class', f'{no}.json')
-    if os.path.exists(class_path):
-        return send_from_directory(os.path.join(BASE_DIR, 'data', 'oncampus_data', 'class'), f'{no}.json', mimetype='application/json; charset=utf-8')
+    class_dataset = store.get('oncampus_data', 'class', f'{no}.json')
+    if class_dataset is not None:
+        # 파일 내용을 그대로 내려주되, 압축본과 ETag 를 캐시해서 사용
+        return response_cache.response(('class', no), class_dataset.version, class_dataset.read_bytes)
     else:
         return "Class data not found for the provided number", 404
 
@@ -62,27 +179,29 @@ def get_class_data_by_ids(no):
     if not requested_ids:
         return jsonify({"error": "No IDs provided"}), 400
 
-    class_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'class', f'{no}.json')
-    if os.path.exists(class_path):
-        with open(class_path, 'r', encoding='utf-8') as file:
-            class_data = json.load(file)
-        filtered_data = [item for item in class_data if item.get('id') in requested_ids]
+    class_dataset = store.get('oncampus_data', 'class', f'{no}.json')
+    if class_dataset is not None:
+        filtered_data = class_dataset.find_by_ids(requested_ids)
         return jsonify(filtered_data)
     else:
         return "Class data not found for the provided number", 404
 
+# 로드맵 추천: count 를 보내면 서로 다른 추천 count 개를 리스트로, seed 를 보내면 같은 결과를 재현
 @app.route('/<int:no>/system/roadmapRec', methods=['POST'])
 def getOnCampusRoadmapSystemRec(no):
     requested_types = request.json.get('type', [])
-
-    system_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'system', f'{no}.json')
-    if os.path.exists(system_path):
-        with open(system_path, 'r', encoding='utf-8') as file:
-            system_data = json.load(file)
-        matching_items = [item for item in system_data if item.get('type') in requested_types]
-        if matching_items:
-            random_item = random.choice(matching_items)
-            return jsonify(random_item)
+    try:
+        count, rng = parse_sample_params(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    system_dataset = store.get('oncampus_data', 'system', f'{no}.json')
+    if system_dataset is not None:
+        # type 별 후보 풀은 데이터 버전마다 한 번만 만든다
+        pools = system_dataset.derived('pools:type', build_type_pools).select(requested_types)
+        picked = sample(pools, count or 1, rng)
+        if picked:
+            return jsonify(picked if count is not None else picked[0])
         else:
             return jsonify({"error": "No matching system data found"}), 404
     else:
@@ -90,13 +209,17 @@ def getOnCampusRoadmapSystemRec(no):
 
 @app.route('/<int:no>/class/roadmapRec', methods=['GET'])
 def getOnCampusRoadmapClassRec(no):
-    class_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'class', f'{no}.json')
-    if os.path.exists(class_path):
-        with open(class_path, 'r', encoding='utf-8') as file:
-            class_data = json.load(file)
+    try:
+        count, rng = parse_sample_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    class_dataset = store.get('oncampus_data', 'class', f'{no}.json')
+    if class_dataset is not None:
+        class_data = class_dataset.data
         if class_data:
-            random_item = random.choice(class_data)
-            response = json.dumps(random_item, ensure_ascii=False, indent=4)
+            picked = sample([class_data], count or 1, rng)
+            response = json.dumps(picked if count is not None else picked[0], ensure_ascii=False, indent=4)
             return Response(response, mimetype="application/json; charset=utf-8")
         else:
             return jsonify({"error": "Class data is empty or not found"}), 404
@@ -106,9 +229,20 @@ def getOnCampusRoadmapClassRec(no):
 #교내지원사업_창업 지원 공고의 get, post 메소드
 @app.route('/<int:no>/notify', methods=['GET'])
 def get_notify_data(no):
-    notify_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'notify', f'{no}.json')
-    if os.path.exists(notify_path):
-        return send_from_directory(os.path.join(BASE_DIR, 'data', 'oncampus_data', 'notify'), f'{no}.json', mimetype='application/json; charset=utf-8')
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    notify_dataset = store.get('oncampus_data', 'notify', f'{no}.json')
+    if notify_dataset is not None:
+        # limit/cursor 가 있으면 메모리의 데이터에서 한 페이지만 반환
+        if limit is not None or cursor is not None:
+            ranks = ordered_ranks(notify_dataset, None)
+            items, next_cursor = paginate_ranks(notify_dataset, ranks, None, limit, cursor)
+            return list_response(items, limit, next_cursor)
+        # 파일 내용을 그대로 내려주되, 압축본과 ETag 를 캐시해서 사용
+        return response_cache.response(('notify', no), notify_dataset.version, notify_dataset.read_bytes)
     else:
         return "Notify data not found for the provided number", 404
 
@@ -118,11 +252,9 @@ def get_notify_data_by_ids(no):
     if not requested_ids:
         return jsonify({"error": "No IDs provided"}), 400
 
-    notify_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'notify', f'{no}.json')
-    if os.path.exists(notify_path):
-        with open(notify_path, 'r', encoding='utf-8') as file:
-            notify_data = json.load(file)
-        notify_data_filtered = [item for item in notify_data if item.get('id') in requested_ids]
+    notify_dataset = store.get('oncampus_data', 'notify', f'{no}.json')
+    if notify_dataset is not None:
+        notify_data_filtered = notify_dataset.find_by_ids(requested_ids)
         return jsonify(notify_data_filtered)
     else:
         return "Notify data not found for the provided number", 404
@@ -131,22 +263,26 @@ def get_notify_data_by_ids(no):
 def get_notify_data_filtered(no):
     requested_type = request.json.get('type', None)
     sorting = request.json.get('sorting', None)
-
-    notify_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'notify', f'{no}.json')
-    if os.path.exists(notify_path):
-        with open(notify_path, 'r', encoding='utf-8') as file:
-            notify_data = json.load(file)
-        if requested_type == '전체':
-            filtered_data = notify_data
-        else:
-            filtered_data = [item for item in notify_data if item.get('type') == requested_type]
-
-        if sorting == 'latest':
-            filtered_data.sort(key=lambda x: (x['startdate'], x['title']))
-        elif sorting == 'savedLot':
-            filtered_data.sort(key=lambda x: (-x['saved'], x['title']))
-
-        return jsonify(filtered_data)
+    try:
+        limit, cursor = parse_page_params(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    notify_dataset = store.get('oncampus_data', 'notify', f'{no}.json')
+    if notify_dataset is not None:
+        notify_data = notify_dataset.data
+
+        def find_positions():
+            with metrics.span('filter'):
+                if requested_type == '전체':
+                    return None
+                return [i for i, item in enumerate(notify_data) if item.get('type') == requested_type]
+
+        # 정렬 순번은 조건별로 캐시하고, 요청마다 한 페이지만 잘라낸다
+        ranks = cached_ranks(('notify/filtered', no, requested_type), notify_dataset, sorting, find_positions)
+        with metrics.span('paginate'):
+            filtered_data, next_cursor = paginate_ranks(notify_dataset, ranks, sorting, limit, cursor)
+        return list_response(filtered_data, limit, next_cursor)
     else:
         return jsonify({"error": "Notify data not found for the provided number"}), 404
 
@@ -156,33 +292,55 @@ def get_notify_data_search(no):
     requested_type = data.get('type', '전체')
     sorting = data.get('sorting', None)
     keyword = data.get('keyword', '')
-
-    notify_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'notify', f'{no}.json')
-    if os.path.exists(notify_path):
-        with open(notify_path, 'r', encoding='utf-8') as file:
-            notify_data = json.load(file)
-        filtered_data = [
-            item for item in notify_data
-            if (requested_type == '전체' or item['type'] == requested_type) and
-               (keyword.lower() in item['title'].lower() or keyword.lower() in item['content'].lower())
-        ]
-
-        if sorting == 'latest':
-            filtered_data.sort(key=lambda x: (x['startdate'], x['title']))
-        elif sorting == 'savedLot':
-            filtered_data.sort(key=lambda x: (-x['saved'], x['title']))
-
-        return jsonify(filtered_data)
+    try:
+        limit, cursor = parse_page_params(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    notify_dataset = store.get('oncampus_data', 'notify', f'{no}.json')
+    if notify_dataset is not None:
+        notify_data = notify_dataset.data
+
+        def find_positions():
+            # 키워드는 역색인으로 후보를 먼저 추린 뒤 나머지 조건을 적용
+            with metrics.span('search'):
+                candidates = search_positions(notify_dataset, keyword)
+            with metrics.span('filter'):
+                return [
+                    i for i in candidates
+                    if requested_type == '전체' or notify_data[i]['type'] == requested_type
+                ]
+
+        ranks = cached_ranks(('notify/search', no, requested_type, normalize_keyword(keyword)),
+                             notify_dataset, sorting, find_positions)
+        # 결과가 있는 첫 페이지 요청만 검색 한 번으로 센다
+        if cursor is None and ranks:
+            search_trends.record(no, keyword)
+        with metrics.span('paginate'):
+            filtered_data, next_cursor = paginate_ranks(notify_dataset, ranks, sorting, limit, cursor)
+        return list_response(filtered_data, limit, next_cursor)
     else:
         return jsonify({"error": "Notify data not found for the provided number"}), 404
 
 @app.route('/offcampus', methods=['GET'])
 def get_offcampus_data():
-    outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-    if os.path.exists(outschool_gara_path):
-        with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-            outschool_data = json.load(file)
-        return Response(json.dumps(outschool_data, ensure_ascii=False, indent=4), mimetype='application/json; charset=utf-8')
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outschool_dataset = store.get('outschool_gara.json')
+    if outschool_dataset is not None:
+        if wants_ndjson():
+            return ndjson_page(outschool_dataset, ordered_ranks(outschool_dataset, None), None, limit, cursor)
+        if limit is not None or cursor is not None:
+            ranks = ordered_ranks(outschool_dataset, None)
+            items, next_cursor = paginate_ranks(outschool_dataset, ranks, None, limit, cursor)
+            return list_response(items, limit, next_cursor)
+        outschool_data = outschool_dataset.data
+        return response_cache.response(
+            ('offcampus',), outschool_dataset.version,
+            lambda: json.dumps(outschool_data, ensure_ascii=False, indent=4).encode('utf-8'))
     else:
         return jsonify({"error": "Outschool data file not found"}), 404
 
@@ -192,11 +350,9 @@ def get_offcampus_data_by_ids():
     if not requested_ids:
         return jsonify({"error": "No IDs provided"}), 400
 
-    outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-    if os.path.exists(outschool_gara_path):
-        with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-            outschool_data = json.load(file)
-        filtered_data = [item for item in outschool_data if item.get('id') in requested_ids]
+    outschool_dataset = store.get('outschool_gara.json')
+    if outschool_dataset is not None:
+        filtered_data = outschool_dataset.find_by_ids(requested_ids)
         return jsonify(filtered_data)
     else:
         return jsonify({"error": "Outschool data file not found"}), 404
@@ -208,22 +364,39 @@ def get_offcampus_data_filter():
     region = filter_conditions.get('region', '전체')
     posttarget = filter_conditions.get('posttarget', '전체')
     sorting = filter_conditions.get('sorting', None)
-
-    outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-    if os.path.exists(outschool_gara_path):
-        with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-            outschool_data = json.load(file)
-        filtered_data = [item for item in outschool_data if
-                          (supporttype == '전체' or item['supporttype'] == supporttype) and
-                          (region == '전체' or item['region'] == region) and
-                          (posttarget == '전체' or posttarget in item['posttarget'])]
-
-        if sorting == 'latest':
-            filtered_data.sort(key=lambda x: (x['startdate'], x['title']))
-        elif sorting == 'savedLot':
-            filtered_data.sort(key=lambda x: (-x['saved'], x['title']))
-
-        return jsonify(filtered_data)
+    with_facets = filter_conditions.get('withFacets', False)
+    try:
+        limit, cursor = parse_page_params(filter_conditions)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outschool_dataset = store.get('outschool_gara.json')
+    if outschool_dataset is not None:
+        facet_index = outschool_dataset.derived('facets', build_facet_index)
+
+        def find_positions():
+            # facet 비트맵 AND 로 필터링
+            with metrics.span('filter'):
+                mask = facet_index.filter_mask(supporttype, region, posttarget)
+                return None if mask == facet_index.all else facet_index.positions(mask)
+
+        ranks = cached_ranks(('offcampus/filtered', supporttype, region, posttarget),
+                             outschool_dataset, sorting, find_positions)
+        if wants_ndjson():
+            if with_facets:
+                return ndjson_page(outschool_dataset, ranks, sorting, limit, cursor,
+                                   facets=facet_index.filter_counts(supporttype, region, posttarget))
+            return ndjson_page(outschool_dataset, ranks, sorting, limit, cursor)
+
+        # 캐시한 정렬 순번에서 한 페이지만 잘라낸다
+        with metrics.span('paginate'):
+            filtered_data, next_cursor = paginate_ranks(outschool_dataset, ranks, sorting, limit, cursor)
+
+        # withFacets 를 보내면 칩별 결과 개수를 함께 반환
+        if with_facets:
+            return list_response(filtered_data, limit, next_cursor,
+                                 facets=facet_index.filter_counts(supporttype, region, posttarget))
+        return list_response(filtered_data, limit, next_cursor)
     else:
         return jsonify({"error": "Outschool data file not found"}), 404
 
@@ -235,35 +408,62 @@ def get_offcampus_data_search():
     posttarget = filter_conditions.get('posttarget', '전체')
     sorting = filter_conditions.get('sorting', None)
     keyword = filter_conditions.get('keyword', '')
-
-    outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-    if os.path.exists(outschool_gara_path):
-        with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-            outschool_data = json.load(file)
-        filtered_data = [
-            item for item in outschool_data
-            if (supporttype == '전체' or item['supporttype'] == supporttype) and
-               (region == '전체' or item['region'] == region) and
-               (posttarget == '전체' or posttarget in item['posttarget']) and
-               (keyword.lower() in item['title'].lower() or keyword.lower() in item['content'].lower())
-        ]
-
-        if sorting == 'latest':
-            filtered_data.sort(key=lambda x: (x['startdate'], x['title']))
-        elif sorting == 'savedLot':
-            filtered_data.sort(key=lambda x: (-x['saved'], x['title']))
-
-        return jsonify(filtered_data)
+    try:
+        limit, cursor = parse_page_params(filter_conditions)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outschool_dataset = store.get('outschool_gara.json')
+    if outschool_dataset is not None:
+        outschool_data = outschool_dataset.data
+
+        def find_positions():
+            # 키워드는 역색인으로 후보를 먼저 추린 뒤 나머지 조건을 적용
+            with metrics.span('search'):
+                candidates = search_positions(outschool_dataset, keyword)
+            with metrics.span('filter'):
+                return [
+                    i for i in candidates
+                    if (supporttype == '전체' or outschool_data[i]['supporttype'] == supporttype) and
+                       (region == '전체' or outschool_data[i]['region'] == region) and
+                       (posttarget == '전체' or posttarget in outschool_data[i]['posttarget'])
+                ]
+
+        ranks = cached_ranks(('offcampus/search', supporttype, region, posttarget, normalize_keyword(keyword)),
+                             outschool_dataset, sorting, find_positions)
+        # 결과가 있는 첫 페이지 요청만 검색 한 번으로 센다
+        if cursor is None and ranks:
+            search_trends.record('offcampus', keyword)
+        if wants_ndjson():
+            return ndjson_page(outschool_dataset, ranks, sorting, limit, cursor)
+
+        with metrics.span('paginate'):
+            filtered_data, next_cursor = paginate_ranks(outschool_dataset, ranks, sorting, limit, cursor)
+        return list_response(filtered_data, limit, next_cursor)
     else:
         return jsonify({"error": "Outschool data file not found"}), 404
 
 @app.route('/offcampus/popular', methods=['GET'])
 def get_popular_search_terms():
-    popular_search_path = os.path.join(BASE_DIR, 'data', 'offcampus_data', 'popular_search.json')
-    if os.path.exists(popular_search_path):
-        with open(popular_search_path, 'r', encoding='utf-8') as file:
-            popular_search_terms = json.load(file)
-        return Response(json.dumps(popular_search_terms, ensure_ascii=False, indent=4), mimetype='application/json; charset=utf-8')
+    popular_search_dataset = store.get('offcampus_data', 'popular_search.json')
+    if popular_search_dataset is not None:
+        popular_search_terms = popular_search_dataset.data
+        return response_cache.response(
+            ('offcampus/popular',), popular_search_dataset.version,
+            lambda: json.dumps(popular_search_terms, ensure_ascii=False, indent=4).encode('utf-8'))
+    else:
+        return jsonify({"error": "Popular search terms file not found"}), 404
+
+# 학교별 인기 검색어 (검색 기록으로 만든 파일이 아직 없으면 교내 공통 목록)
+@app.route('/<int:no>/popular', methods=['GET'])
+def get_school_popular_search_terms(no):
+    popular_search_dataset = (store.get('oncampus_data', 'popular_search', f'{no}.json') or
+                              store.get('oncampus_data', 'onca_popular_search.json'))
+    if popular_search_dataset is not None:
+        popular_search_terms = popular_search_dataset.data
+        return response_cache.response(
+            ('popular', no), popular_search_dataset.version,
+            lambda: json.dumps(popular_search_terms, ensure_ascii=False, indent=4).encode('utf-8'))
     else:
         return jsonify({"error": "Popular search terms file not found"}), 404
 
@@ -274,33 +474,45 @@ def get_offcampus_roadmap_recommend():
     region = data.get('region', None)
     age = data.get('age', None)
     supporttypes = data.get('supporttype', [])
-
-    outschool_gara_path = os.path.join(BASE_DIR, 'data', 'outschool_gara.json')
-    if os.path.exists(outschool_gara_path):
-        with open(outschool_gara_path, 'r', encoding='utf-8') as file:
-            outschool_data = json.load(file)
-        filtered_data = [
-            item for item in outschool_data
-            if ((posttarget_bool is None or (posttarget_bool and '예비창업자' not in item['posttarget']) or
-                 (not posttarget_bool and '예비창업자' in item['posttarget'])) and
-                (region is None or item['region'] == region) and
-                (age is None or (item['agestart'] <= age <= item['ageend'])) and
-                (not supporttypes or any(supporttype in item['supporttype'] for supporttype in supporttypes)))
-        ]
-        return jsonify(filtered_data)
+    try:
+        count, rng = parse_sample_params(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outschool_dataset = store.get('outschool_gara.json')
+    if outschool_dataset is not None:
+        with metrics.span('filter'):
+            facet_index = outschool_dataset.derived('facets', build_facet_index)
+            mask = (facet_index.pre_founder(posttarget_bool) &
+                    (facet_index.all if region is None else facet_index.equal('region', region)) &
+                    facet_index.age(age) &
+                    facet_index.supporttype_contains(supporttypes))
+            positions = facet_index.positions(mask)
+            if count is not None:
+                # count 를 보내면 조건에 맞는 공고 중 count 개만 무작위로 반환
+                positions = sample([positions], count, rng)
+        outschool_data = outschool_dataset.data
+        if wants_ndjson():
+            return ndjson_response(outschool_data[i] for i in positions)
+        return list_response([outschool_data[i] for i in positions])
     else:
         return jsonify({"error": "Outschool data file not found"}), 404
 
+def support_group_types(data):
+    types = set(item['type'] for item in data)
+    order = ["멘토링", "동아리", "특강", "경진대회 및 캠프", "공간", "기타"]
+    return sorted(types, key=lambda x: order.index(x) if x in order else len(order))
+
 @app.route('/<int:no>/supportgroup/tablist', methods=['GET'])
 def get_support_group_tablist(no):
-    support_group_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'support_group', f'{no}.json')
-    if os.path.exists(support_group_path):
-        with open(support_group_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        types = set(item['type'] for item in data)
-        order = ["멘토링", "동아리", "특강", "경진대회 및 캠프", "공간", "기타"]
-        sorted_types = sorted(types, key=lambda x: order.index(x) if x in order else len(order))
-        return Response(json.dumps(sorted_types, ensure_ascii=False), mimetype='application/json; charset=utf-8')
+    support_group_dataset = store.get('oncampus_data', 'support_group', f'{no}.json')
+    if support_group_dataset is not None:
+        data = support_group_dataset.data
+
+        def build():
+            return json.dumps(support_group_types(data), ensure_ascii=False).encode('utf-8')
+
+        return response_cache.response(('supportgroup/tablist', no), support_group_dataset.version, build)
     else:
         return "Support group data not found for the provided number", 404
 
@@ -318,29 +530,73 @@ def get_support_group_by_type(no, type_name):
     if not real_type:
         return "Invalid type", 400
 
-    support_group_path = os.path.join(BASE_DIR, 'data', 'oncampus_data', 'support_group', f'{no}.json')
-    if os.path.exists(support_group_path):
-        with open(support_group_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        filtered_data = [item for item in data if item['type'] == real_type]
-        return Response(json.dumps(filtered_data, ensure_ascii=False, indent=4), mimetype='application/json; charset=utf-8')
+    support_group_dataset = store.get('oncampus_data', 'support_group', f'{no}.json')
+    if support_group_dataset is not None:
+        data = support_group_dataset.data
+
+        def build():
+            filtered_data = [item for item in data if item['type'] == real_type]
+            return json.dumps(filtered_data, ensure_ascii=False, indent=4).encode('utf-8')
+
+        return response_cache.response(('supportgroup', no, real_type), support_group_dataset.version, build)
     else:
         return "Support group data not found for the provided number", 404
 
+# 교내 데이터 일괄 조회: 여러 학교의 여러 섹션을 NDJSON 한 줄씩 스트리밍으로 반환
+# body: {"nos": [1, 12], "sections": ["system", "class", "notify", "supportgroup", "tablist"], "inlineLogos": true}
+# 각 줄: {"no": 1, "section": "system", "data": [...]} 또는 {"no": 1, "section": "logo", "data": "<svg ...>"}
+#       데이터가 없으면 {"no": 1, "section": "system", "error": "..."}
+BULK_SECTIONS = {
+    "system": ('oncampus_data', 'system'),
+    "class": ('oncampus_data', 'class'),
+    "notify": ('oncampus_data', 'notify'),
+    "supportgroup": ('oncampus_data', 'support_group'),
+    "tablist": ('oncampus_data', 'support_group'),
+}
+BULK_MAX_SCHOOLS = 100
+
+@app.route('/oncampus/bulk', methods=['POST'])
+def get_oncampus_bulk():
+    data = request.json
+    nos = data.get('nos', [])
+    sections = data.get('sections') or list(BULK_SECTIONS)
+    inline_logos = data.get('inlineLogos', False)
+
+    if not nos or not isinstance(nos, list) or not all(isinstance(no, int) and not isinstance(no, bool) for no in nos):
+        return jsonify({"error": "nos must be a non-empty list of school numbers"}), 400
+    if len(nos) > BULK_MAX_SCHOOLS:
+        return jsonify({"error": f"At most {BULK_MAX_SCHOOLS} schools per request"}), 400
+    if not isinstance(sections, list) or any(section not in BULK_SECTIONS for section in sections):
+        return jsonify({"error": f"sections must be a list of {', '.join(BULK_SECTIONS)}"}), 400
+
+    def generate():
+        for no in nos:
+            for section in sections:
+                dataset = store.get(*BULK_SECTIONS[section], f'{no}.json')
+                if dataset is None:
+                    line = {"no": no, "section": section, "error": f"{section} data not found"}
+                elif section == 'tablist':
+                    line = {"no": no, "section": section, "data": support_group_types(dataset.data)}
+                else:
+                    line = {"no": no, "section": section, "data": dataset.data}
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+            if inline_logos:
+                svg = logo_assets.svg(no)
+                if svg is not None:
+                    line = {"no": no, "section": "logo", "data": svg}
+                else:
+                    line = {"no": no, "section": "logo", "error": "logo not found"}
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson; charset=utf-8')
+
 
 # 여기서부터 시스템 데이터 부분
 
 @app.route('/getUserNickName', methods=['POST'])
 def get_user_nickname():
     requested_nickname = request.json.get('nickname', None)
-    user_info_path = os.path.join(BASE_DIR, 'data', 'system_data', 'user_info.json')
-    if os.path.exists(user_info_path):
-        with open(user_info_path, 'r', encoding='utf-8') as file:
-            user_info_data = json.load(file)
-        existing_nicknames = [user['nickname'] for user in user_info_data['users']]
-        return jsonify(not requested_nickname in existing_nicknames)
-    else:
-        return jsonify({"error": "User info file not found"}), 404
+    return jsonify(user_repository.is_nickname_available(requested_nickname))
 
 @app.route('/createuserinfo', methods=['POST'])
 def post_create_userinfo():
@@ -349,25 +605,11 @@ def post_create_userinfo():
     if not nickname or kakaoUserID is None:
         return jsonify({"error": "Nickname and kakaoUserID are required"}), 400
 
-    userinfo_path = os.path.join(BASE_DIR, 'data', 'system_data', 'user_info.json')
-    if os.path.exists(userinfo_path) and os.stat(userinfo_path).st_size != 0:
-        with open(userinfo_path, 'r', encoding='utf-8') as file:
-            userinfo = json.load(file)
-    else:
-        userinfo = {"users": []}
-
-    existing_user = next((user for user in userinfo['users'] if user.get('kakaoUserID') == kakaoUserID), None)
-    if existing_user:
-        existing_user['nickname'] = nickname
-        user_uuid = existing_user['uuid']  # 기존 사용자의 uuid를 사용
-    else:
-        # 새로운 uuid 생성
-        user_uuid = f"{datetime.now().strftime('%y%m%d')}{len(userinfo['users'])+1:03d}"
-        userinfo['users'].append({"uuid": user_uuid, "nickname": nickname, "kakaoUserID": kakaoUserID})
-    
-    # 파일 업데이트
-    with open(userinfo_path, 'w', encoding='utf-8') as file:
-        json.dump(userinfo, file, ensure_ascii=False, indent=4)
+    # kakaoUserID 가 이미 있으면 닉네임만 바꾸고 기존 uuid 를, 없으면 새 uuid 를 받는다
+    try:
+        user_uuid = user_repository.upsert(kakaoUserID, nickname)
+    except NicknameTaken:
+        return jsonify({"error": "Nickname already in use"}), 409
 
     # 수정된 부분: JSON 형태로 uuid를 반환
     return jsonify({'uuid': user_uuid})
@@ -378,33 +620,31 @@ def get_change_usernickname():
     data = request.json
     uuid = data.get('uuid')
     new_nickname = data.get('nickname')
-    user_info_path = os.path.join(BASE_DIR, 'data', 'system_data', 'user_info.json')
-    if not os.path.exists(user_info_path):
-        return jsonify({"error": "User info file not found"}), 404
-    with open(user_info_path, 'r', encoding='utf-8') as file:
-        user_info = json.load(file)
-    user = next((user for user in user_info['users'] if user['uuid'] == uuid), None)
-    if user:
-        user['nickname'] = new_nickname
-        with open(user_info_path, 'w', encoding='utf-8') as file:
-            json.dump(user_info, file, ensure_ascii=False, indent=4)
+    try:
+        changed = user_repository.change_nickname(uuid, new_nickname)
+    except NicknameTaken:
+        return jsonify({"error": "Nickname already in use"}), 409
+    if changed:
         return jsonify({"success": True})
     else:
         return jsonify({"error": "User not found"}), 404
 
 @app.route('/question/<question_id>', methods=['GET'])
 def get_question_data(question_id):
-    file_path = os.path.join(BASE_DIR, 'Q&A', 'question_data', f'{question_id}q.json')
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
-            question_data = json.load(file)
+    try:
+        limit, cursor = parse_page_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if question_repository.exists(question_id):
+        question_data, next_cursor = question_repository.list(question_id, limit, cursor)
+        if limit is not None:
+            return list_response(question_data, limit, next_cursor)
         return Response(json.dumps(question_data, ensure_ascii=False, indent=4), mimetype="application/json; charset=utf-8")
     else:
         return jsonify({"error": "Question data not found"}), 404
 
-# 이후에 있는 /question/<question_id>/write, /questionbyqid/<qid> 등의 라우트도 비슷한 방식으로 파일 경로를 `os.path.join`을 사용하여 수정해 주세요. 
-
-# 질문 생성 및 업데이트 메소드
+# 질문 생성 메소드 (qid 할당과 추가는 저장소의 트랜잭션 안에서 처리)
 @app.route('/question/<question_id>/write', methods=['POST'])
 def write_question_data(question_id):
     question_text = request.json.get('question')
@@ -413,18 +653,8 @@ def write_question_data(question_id):
     user_name = request.json.get('nickname')
     profile_num = request.json.get('profileNum', 1)  # 기본값을 1로 설정
 
-    file_path = os.path.join(BASE_DIR, 'Q&A', 'question_data', f'{question_id}q.json')
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            last_qid = data[-1]['qid'] if data else f'{question_id}q000'
-            qid_num = int(last_qid[-3:]) + 1
-    else:
-        qid_num = 1
-
-    qid = f'{question_id}q{qid_num:03d}'
     today = datetime.now().strftime('%y%m%d')
-    new_question = {
+    new_question = question_repository.append(question_id, lambda qid: {
         "userUUID": user_uuid,
         "userName": user_name,
         "qid": qid,
@@ -435,33 +665,17 @@ def write_question_data(question_id):
         "answerCount": 0,
         "contactAnswer": False,
         "profileNum": profile_num
-    }
+    })
 
-    if os.path.exists(file_path):
-        with open(file_path, 'r+', encoding='utf-8') as file:
-            data = json.load(file)
-            data.append(new_question)
-            file.seek(0)
-            json.dump(data, file, ensure_ascii=False, indent=4)
-            file.truncate()
-    else:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump([new_question], file, ensure_ascii=False, indent=4)
-
-    return jsonify({"qid": qid})
+    return jsonify({"qid": new_question['qid']})
 
 @app.route('/questionbyqid/<qid>', methods=['GET'])
 def get_question_data_by_qid(qid):
-    question_id = qid[:-4]
-    file_path = os.path.join(BASE_DIR, 'Q&A', 'question_data', f'{question_id}q.json')
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
-            questions = json.load(file)
-            question_data = next((item for item in questions if item['qid'] == qid), None)
-            if question_data:
-                return Response(json.dumps(question_data, ensure_ascii=False, indent=4), mimetype="application/json; charset=utf-8")
-            else:
-                return jsonify({"error": "Question with given qid not found"}), 404
+    question_data = question_repository.get(qid)
+    if question_data:
+        return Response(json.dumps(question_data, ensure_ascii=False, indent=4), mimetype="application/json; charset=utf-8")
+    elif question_repository.exists(qid[:-4]):
+        return jsonify({"error": "Question with given qid not found"}), 404
     else:
         return jsonify({"error": "Question data file not found"}), 404
 
@@ -0,0 +1,85 @@
+import os, re, json, threading
+from response_cache import CachedBody
+
+# 학교 로고(SVG) 정적 자원
+# 시작할 때 모든 로고를 읽어 최소화(주석/태그 사이 공백 제거)한 뒤 gzip/br 압축본, 내용 해시 ETag 와 함께
+# 메모리에 들고 있다가 바로 응답한다. 모든 로고를 한 번에 내려주는 번들도 같은 방식으로 캐시한다.
+
+SVG_MIMETYPE = 'image/svg+xml'
+CACHE_CONTROL = 'public, max-age=86400'
+# ?v=<해시> 처럼 내용 해시가 붙은 URL 은 내용이 바뀌면 URL 도 바뀌므로 오래 캐시해도 된다
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_COMMENT = re.compile(r'<!--.*?-->', re.S)
+_BETWEEN_TAGS = re.compile(r'>\s+<')
+
+
+def minify_svg(text):
+    return _BETWEEN_TAGS.sub('><', _COMMENT.sub('', text)).strip()
+
+
+class LogoAssets:
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _scan(self):
+        # 로고 파일별 (mtime, size)
+        stamps = {}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                stem, ext = os.path.splitext(name)
+                if ext != '.svg' or not stem.isdigit():
+                    continue
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                stamps[name] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def reload(self):
+        stamps = self._scan()
+        logos = {}
+        for name in stamps:
+            with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as file:
+                logos[int(os.path.splitext(name)[0])] = minify_svg(file.read())
+        assets = {no: CachedBody(None, svg.encode('utf-8'), SVG_MIMETYPE) for no, svg in logos.items()}
+        with self._lock:
+            self.logos = logos
+            self.assets = assets
+            self._bundles = {}
+            self._stamps = stamps
+
+    def changed(self):
+        # 마지막으로 읽은 뒤 로고 파일이 추가/삭제/수정되었는지
+        return self._scan() != self._stamps
+
+    def svg(self, no):
+        return self.logos.get(no)
+
+    def versions(self):
+        return {no: asset.etag for no, asset in self.assets.items()}
+
+    def response(self, no, version=None):
+        asset = self.assets.get(no)
+        if asset is None:
+            return None
+        cache_control = IMMUTABLE_CACHE_CONTROL if version == asset.etag else CACHE_CONTROL
+        return asset.to_response(cache_control)
+
+    def bundle_response(self, nos=None):
+        # {"1": "<svg ...>", ...} 형태로 여러 로고를 한 번에 반환
+        key = tuple(sorted(self.logos)) if nos is None else tuple(sorted(set(nos) & set(self.logos)))
+        with self._lock:
+            bundle = self._bundles.get(key)
+        if bundle is None:
+            body = json.dumps({str(no): self.logos[no] for no in key}, ensure_ascii=False, separators=(',', ':'))
+            bundle = CachedBody(None, body.encode('utf-8'), 'application/json; charset=utf-8')
+            with self._lock:
+                # 요청마다 조합이 다를 수 있으므로 개수를 제한
+                if len(self._bundles) >= 256:
+                    self._bundles.clear()
+                self._bundles[key] = bundle
+        return bundle.to_response(CACHE_CONTROL)
@@ -0,0 +1,192 @@
+import os, json, random, argparse, shutil
+
+# 벤치마크용 가짜 데이터 생성기
+# 실제 data/ 폴더와 같은 구조(outschool_gara.json, oncampus_data/{class,notify,system,support_group}/{no}.json,
+# system_data/user_info.json, Q&A/question_data)를 원하는 규모로 만든다.
+
+WORDS = ['창업', '지원', '사업', '모집', '공고', '청년', '예비창업자', '보육', '센터', '입주기업', '멘토링',
+         '투자', '글로벌', '기술', '혁신', '스타트업', '경진대회', '캠프', '교육', '네트워크', '데모데이',
+         '2024년', '1차', '2차', '서울', '경기', '대학교', '창업지원단', '액셀러레이터', '바우처']
+SUPPORT_TYPES = ['시설/공간/보육', '행사/네트워크', '창업교육', '경영/사업화/창업', '융자/금융',
+                 '인력', '판로/해외진출/수출', '기타']
+REGIONS = ['전체', '서울', '경기', '인천', '부산', '대구', '광주', '대전']
+POST_TARGETS = ['예비창업자', '1년미만', '2년미만', '3년미만', '5년미만', '7년미만', '10년미만']
+NOTIFY_TYPES = ['창업 멘토링', '창업 동아리', '창업 특강', '창업 경진대회', '창업 공간', '기타']
+SYSTEM_TYPES = ['창업휴학제도', '창업대체학점 인정제', '창업장학금', '창업 강좌']
+SUPPORT_GROUP_TYPES = ['멘토링', '동아리', '특강', '경진대회 및 캠프', '공간', '기타']
+
+LOGO_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" fill="none" viewBox="0 0 24 24">\n'
+            '  <circle cx="12" cy="12" r="10" fill="#0C2E86"/>\n'
+            '  <text x="12" y="16" font-size="10" text-anchor="middle" fill="#fff">{no}</text>\n'
+            '</svg>\n')
+
+
+def _text(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _date(rng, year=2024):
+    return int(f'{year}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}')
+
+
+def offcampus_items(rng, count):
+    items = []
+    for i in range(count):
+        agestart = rng.choice([0, 15, 19, 20, 25])
+        items.append({
+            "id": 12401020001 + i,
+            "organize": rng.choice(['서울특별시', '경기도', '중소벤처기업부', '창업진흥원']),
+            "title": _text(rng, 4, 10),
+            "content": _text(rng, 10, 40),
+            "startdate": _date(rng),
+            "enddate": _date(rng, 2025),
+            "target": "대학생,일반인,일반기업,1인 창조기업",
+            "agestart": agestart,
+            "ageend": agestart + rng.choice([19, 24, 29, 39, 99]),
+            "supporttype": rng.choice(SUPPORT_TYPES),
+            "link": f"https://www.k-startup.go.kr/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn={i}",
+            "region": rng.choice(REGIONS),
+            "posttarget": sorted(rng.sample(POST_TARGETS, rng.randint(1, len(POST_TARGETS)))),
+            "saved": rng.randint(0, 500),
+            "classification": "교외사업",
+            "contact": "contact@example.com"
+        })
+    return items
+
+
+def notify_items(rng, no, count):
+    return [{
+        "id": no * 1000000000 + 10400001 + i,
+        "type": rng.choice(NOTIFY_TYPES),
+        "title": _text(rng, 2, 6),
+        "content": _text(rng, 5, 20),
+        "startdate": int(f'24{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}'),
+        "classification": "교내사업",
+        "detailurl": "https://example.ac.kr/startup/index.html",
+        "saved": rng.randint(0, 100)
+    } for i in range(count)]
+
+
+def class_items(rng, no, count):
+    return [{
+        "id": no * 100000000 + 1020001 + i,
+        "title": _text(rng, 1, 3),
+        "liberal": rng.choice(['일반선택', '교양필수', '전공선택']),
+        "credit": rng.randint(1, 3),
+        "session": rng.sample(['1학기', '2학기'], rng.randint(1, 2)),
+        "instructor": rng.choice(['김교수', '이교수', '박교수']),
+        "content": _text(rng, 20, 60),
+        "classification": "창업강의"
+    } for i in range(count)]
+
+
+def system_items(rng, no, count):
+    return [{
+        "id": no * 10000000000 + 224022201 + i,
+        "title": _text(rng, 1, 3),
+        "type": rng.choice(SYSTEM_TYPES),
+        "content": _text(rng, 10, 30),
+        "target": "재학생",
+        "classification": "창업제도"
+    } for i in range(count)]
+
+
+def support_group_items(rng, count):
+    return [{
+        "type": rng.choice(SUPPORT_GROUP_TYPES),
+        "title": _text(rng, 2, 5),
+        "content": _text(rng, 5, 15)
+    } for _ in range(count)]
+
+
+def question_items(rng, question_id, count):
+    return [{
+        "answerCount": rng.randint(0, 5),
+        "contactAnswer": False,
+        "date": "240224",
+        "forContact": False,
+        "like": rng.randint(0, 50),
+        "profileNum": 1,
+        "qid": f'{question_id}q{i + 1:03d}',
+        "question": _text(rng, 5, 15),
+        "userName": f'user{i}',
+        "userUUID": 10000 + i
+    } for i in range(count)]
+
+
+def _dump(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False)
+
+
+# generate 가 만든 폴더임을 표시하는 파일. 이 파일이 있는 폴더만 지우고 다시 만든다
+MARKER_NAME = '.sb-bench-generated'
+
+
+def _prepare(directory):
+    if os.path.exists(directory):
+        if not os.path.exists(os.path.join(directory, MARKER_NAME)):
+            raise FileExistsError(f'{directory} exists and was not created by bench.datagen; refusing to overwrite it')
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    with open(os.path.join(directory, MARKER_NAME), 'w', encoding='utf-8'):
+        pass
+
+
+def generate(out_dir, items=1000, schools=38, per_school=None, users=1000, questions=100, seed=0):
+    # out_dir/data, out_dir/Q&A 를 만들고 각 경로를 반환
+    # 이미 있는 data/, Q&A/ 가 이전에 generate 로 만든 것이 아니면 FileExistsError (실제 데이터 보호)
+    rng = random.Random(seed)
+    per_school = per_school or max(10, items // max(schools, 1))
+    data_dir = os.path.join(out_dir, 'data')
+    qa_dir = os.path.join(out_dir, 'Q&A')
+    _prepare(data_dir)
+    _prepare(qa_dir)
+
+    offcampus = offcampus_items(rng, items)
+    _dump(os.path.join(data_dir, 'outschool_gara.json'), offcampus)
+    _dump(os.path.join(data_dir, 'offcampus_data', 'popular_search.json'), rng.sample(WORDS, 6))
+    _dump(os.path.join(data_dir, 'oncampus_data', 'onca_popular_search.json'), rng.sample(WORDS, 6))
+    _dump(os.path.join(data_dir, 'school_link.json'),
+          [{"no": no, "name": f"{no}대학교", "url": "https://example.ac.kr"} for no in range(1, schools + 1)])
+
+    for no in range(1, schools + 1):
+        _dump(os.path.join(data_dir, 'oncampus_data', 'notify', f'{no}.json'), notify_items(rng, no, per_school))
+        _dump(os.path.join(data_dir, 'oncampus_data', 'class', f'{no}.json'), class_items(rng, no, per_school))
+        _dump(os.path.join(data_dir, 'oncampus_data', 'system', f'{no}.json'), system_items(rng, no, max(5, per_school // 10)))
+        _dump(os.path.join(data_dir, 'oncampus_data', 'support_group', f'{no}.json'), support_group_items(rng, per_school))
+        os.makedirs(os.path.join(data_dir, 'school_logo'), exist_ok=True)
+        with open(os.path.join(data_dir, 'school_logo', f'{no}.svg'), 'w', encoding='utf-8') as file:
+            file.write(LOGO_SVG.format(no=no))
+
+    _dump(os.path.join(data_dir, 'system_data', 'user_info.json'), {"users": [
+        {"kakaoUserID": 100000000 + i, "nickname": f'닉네임{i}', "uuid": f'240101{i + 1:03d}'} for i in range(users)]})
+
+    for item in offcampus[:min(10, len(offcampus))]:
+        question_id = str(item['id'])
+        _dump(os.path.join(qa_dir, 'question_data', f'{question_id}q.json'), question_items(rng, question_id, questions))
+
+    return data_dir, qa_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic data/ tree for benchmarks')
+    parser.add_argument('out_dir')
+    parser.add_argument('--items', type=int, default=1000, help='off-campus notices')
+    parser.add_argument('--schools', type=int, default=38)
+    parser.add_argument('--per-school', type=int, default=None, help='items per on-campus file')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--questions', type=int, default=100, help='questions per Q&A thread')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        data_dir, qa_dir = generate(args.out_dir, args.items, args.schools, args.per_school,
+                                    args.users, args.questions, args.seed)
+    except FileExistsError as e:
+        parser.error(str(e))
+    print(json.dumps({"data_dir": data_dir, "qa_dir": qa_dir}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+import os, sys, json, time, random, argparse, tempfile, threading, subprocess, http.client, itertools
+
+# 벤치마크 실행기
+#   python -m bench.run --items 10000 --schools 38 --mode both --output bench.json
+# 가짜 데이터를 만든 뒤 app.py 의 모든 라우트를
+#   - testclient: Flask test client 로 순차 호출 (핸들러 자체 비용)
+#   - http: 실제 HTTP 서버에 여러 스레드로 동시에 요청 (keep-alive 연결 사용)
+# 방식으로 측정해서 처리량과 p50/p95/p99 지연시간을 JSON 으로 출력한다.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from bench.datagen import generate, WORDS, SUPPORT_TYPES, REGIONS, POST_TARGETS, NOTIFY_TYPES, SYSTEM_TYPES
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, sizes, elapsed):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else None,
+        "mean_ms": ms(sum(latencies) / count) if count else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else None,
+        "mean_bytes": round(sum(sizes) / len(sizes), 1) if sizes else None,
+    }
+
+
+def build_cases(store, schools, seed=0):
+    # (이름, 메서드, 경로, body 생성 함수) 목록. body 함수는 호출 순번을 받는다
+    rng = random.Random(seed)
+    offcampus = store.get('outschool_gara.json').data
+    offcampus_ids = [item['id'] for item in offcampus]
+    question_ids = [str(item['id']) for item in offcampus[:10]]
+    nos = list(range(1, schools + 1))
+    counter = itertools.count()
+
+    def school_ids(section):
+        return {no: [item['id'] for item in store.get('oncampus_data', section, f'{no}.json').data] for no in nos}
+
+    notify_ids, class_ids, system_ids = school_ids('notify'), school_ids('class'), school_ids('system')
+    no = lambda: rng.choice(nos)
+    sample = lambda ids, k: rng.sample(ids, min(k, len(ids)))
+
+    def ids_case(section, ids_by_school):
+        def make(i):
+            school = no()
+            return f'/{school}/{section}/ids', {"ids": sample(ids_by_school[school], 100)}
+        return make
+
+    def offcampus_filter(i):
+        return '/offcampus/filtered', {
+            "supporttype": rng.choice(SUPPORT_TYPES + ['전체']), "region": rng.choice(REGIONS),
+            "posttarget": rng.choice(POST_TARGETS + ['전체']), "sorting": rng.choice(['latest', 'savedLot', None])}
+
+    def offcampus_search(i):
+        body = offcampus_filter(i)[1]
+        body["keyword"] = rng.choice(WORDS)
+        return '/offcampus/search', body
+
+    return [
+        ('logo', 'GET', lambda i: (f'/{no()}/logo', None)),
+        ('logo_bundle', 'GET', lambda i: ('/logos/bundle', None)),
+        ('logo_bundle_nos', 'GET', lambda i: (f'/logos/bundle?nos={",".join(map(str, sample(nos, 10)))}', None)),
+        ('logo_versions', 'GET', lambda i: ('/logos/versions', None)),
+        ('system', 'GET', lambda i: (f'/{no()}/system', None)),
+        ('system_ids', 'POST', ids_case('system', system_ids)),
+        ('system_roadmapRec', 'POST', lambda i: (f'/{no()}/system/roadmapRec', {"type": sample(SYSTEM_TYPES, 2)})),
+        ('class', 'GET', lambda i: (f'/{no()}/class', None)),
+        ('class_ids', 'POST', ids_case('class', class_ids)),
+        ('class_roadmapRec', 'GET', lambda i: (f'/{no()}/class/roadmapRec', None)),
+        ('notify', 'GET', lambda i: (f'/{no()}/notify', None)),
+        ('notify_ids', 'POST', ids_case('notify', notify_ids)),
+        ('notify_filtered', 'POST', lambda i: (f'/{no()}/notify/filtered', {
+            "type": rng.choice(NOTIFY_TYPES + ['전체']), "sorting": rng.choice(['latest', 'savedLot', None])})),
+        ('notify_search', 'POST', lambda i: (f'/{no()}/notify/search', {
+            "type": '전체', "keyword": rng.choice(WORDS), "sorting": 'latest'})),
+        ('offcampus', 'GET', lambda i: ('/offcampus', None)),
+        ('offcampus_ids', 'POST', lambda i: ('/offcampus/ids', {"ids": sample(offcampus_ids, 100)})),
+        ('offcampus_filtered', 'POST', offcampus_filter),
+        ('offcampus_search', 'POST', offcampus_search),
+        ('offcampus_popular', 'GET', lambda i: ('/offcampus/popular', None)),
+        ('school_popular', 'GET', lambda i: (f'/{no()}/popular', None)),
+        ('offcampus_roadmapRec', 'POST', lambda i: ('/offcampus/roadmapRec', {
+            "posttarget": rng.choice([True, False, None]), "region": rng.choice(REGIONS + [None]),
+            "age": rng.randint(18, 45), "supporttype": sample(SUPPORT_TYPES, 2)})),
+        ('supportgroup_tablist', 'GET', lambda i: (f'/{no()}/supportgroup/tablist', None)),
+        ('supportgroup_type', 'GET', lambda i: (
+            f'/{no()}/supportgroup/{rng.choice(["mentoring", "club", "lecture", "competition", "space", "etc"])}', None)),
+        ('oncampus_bulk', 'POST', lambda i: ('/oncampus/bulk', {
+            "nos": sample(nos, 5), "sections": ['system', 'notify', 'tablist'], "inlineLogos": rng.random() < 0.5})),
+        ('getUserNickName', 'POST', lambda i: ('/getUserNickName', {"nickname": f'닉네임{rng.randint(0, 2000)}'})),
+        ('createuserinfo', 'POST', lambda i: ('/createuserinfo', {
+            "nickname": f'bench{next(counter)}', "kakaoUserID": f'bench-{time.time_ns()}-{rng.random()}'})),
+        ('changeNickName', 'POST', lambda i: ('/changeNickName', {
+            "uuid": '240101001', "nickname": f'bench-change-{next(counter)}'})),
+        ('question', 'GET', lambda i: (f'/question/{rng.choice(question_ids)}', None)),
+        ('question_write', 'POST', lambda i: (f'/question/{rng.choice(question_ids)}/write', {
+            "question": '벤치마크 질문', "forContact": False, "uuid": '240101001', "nickname": 'bench'})),
+        ('questionbyqid', 'GET', lambda i: (f'/questionbyqid/{rng.choice(question_ids)}q{rng.randint(1, 50):03d}', None)),
+        ('metrics', 'GET', lambda i: ('/metrics', None)),
+    ]
+
+
+def run_testclient(app, cases, requests, warmup):
+    client = app.test_client()
+    results = {}
+    for name, method, make in cases:
+        for i in range(warmup):
+            path, body = make(i)
+            client.open(path, method=method, json=body)
+        latencies, sizes, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(requests):
+            path, body = make(i)
+            t0 = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            data = response.get_data()
+            latencies.append(time.perf_counter() - t0)
+            sizes.append(len(data))
+            if response.status_code >= 500:
+                errors += 1
+        results[name] = summarize(latencies, errors, sizes, time.perf_counter() - started)
+    return results
+
+
+def _http_worker(host, port, method, make, deadline, quota, lock, latencies, sizes, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = 0
+    while time.perf_counter() < deadline:
+        with lock:
+            if quota[0] <= 0:
+                break
+            quota[0] -= 1
+        path, body = make(i)
+        i += 1
+        headers = {'Accept-Encoding': 'gzip'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            status, data = 599, b''
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            sizes.append(len(data))
+            if status >= 500:
+                errors[0] += 1
+    conn.close()
+
+
+def run_http(host, port, cases, requests, concurrency, duration):
+    results = {}
+    for name, method, make in cases:
+        latencies, sizes, errors, quota = [], [], [0], [requests]
+        lock = threading.Lock()
+        started = time.perf_counter()
+        deadline = started + duration
+        threads = [threading.Thread(target=_http_worker, args=(
+            host, port, method, make, deadline, quota, lock, latencies, sizes, errors)) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results[name] = summarize(latencies, errors[0], sizes, time.perf_counter() - started)
+        results[name]["concurrency"] = concurrency
+    return results
+
+
+def _wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/offcampus/popular')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on {host}:{port} did not start')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every route in app.py')
+    parser.add_argument('--items', type=int, default=1000, help='off-campus notices (1k ~ 1M)')
+    parser.add_argument('--schools', type=int, default=38)
+    parser.add_argument('--per-school', type=int, default=None)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--questions', type=int, default=100)
+    parser.add_argument('--mode', choices=['testclient', 'http', 'both'], default='both')
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help='max seconds per route in http mode')
+    parser.add_argument('--server', choices=['inprocess', 'serve'], default='inprocess',
+                        help='http mode: threaded server in this process, or serve.py with --workers')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--routes', default=None, help='comma separated route names to run')
+    parser.add_argument('--workdir', default=None)
+    parser.add_argument('--output', default=None, help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='sb-bench-')
+    t0 = time.perf_counter()
+    try:
+        data_dir, qa_dir = generate(workdir, args.items, args.schools, args.per_school, args.users, args.questions)
+    except FileExistsError as e:
+        parser.error(str(e))
+    generate_seconds = time.perf_counter() - t0
+
+    # app 은 import 시점에 데이터 경로를 읽으므로 환경 변수를 먼저 설정한다
+    os.environ['SB_DATA_DIR'] = data_dir
+    os.environ['SB_QA_DIR'] = qa_dir
+    t0 = time.perf_counter()
+    from app import app, store
+    import_seconds = time.perf_counter() - t0
+
+    cases = build_cases(store, args.schools)
+    if args.routes:
+        selected = set(args.routes.split(','))
+        cases = [case for case in cases if case[0] in selected]
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != 'output'},
+        "setup": {"generate_seconds": round(generate_seconds, 3), "app_import_seconds": round(import_seconds, 3),
+                  "workdir": workdir},
+    }
+
+    if args.mode in ('testclient', 'both'):
+        report["testclient"] = run_testclient(app, cases, args.requests, args.warmup)
+
+    if args.mode in ('http', 'both'):
+        host = '127.0.0.1'
+        if args.server == 'serve':
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT_DIR, 'serve.py'), '--host', host, '--port', str(args.port),
+                 '--workers', str(args.workers), '--reload-interval', '0'],
+                env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            port = args.port
+            server = None
+        else:
+            from werkzeug.serving import make_server, WSGIRequestHandler
+
+            class QuietHandler(WSGIRequestHandler):
+                protocol_version = 'HTTP/1.1'
+
+                def log_request(self, *args, **kwargs):
+                    pass
+
+            server = make_server(host, 0, app, threaded=True, request_handler=QuietHandler)
+            port = server.port
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            process = None
+        try:
+            _wait_for_port(host, port)
+            report["http"] = run_http(host, port, cases, args.requests, args.concurrency, args.duration)
+        finally:
+            if server is not None:
+                server.shutdown()
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import os, json, time, threading, itertools
+
+# data/ 아래 JSON 파일들을 한 번만 파싱해서 메모리에 들고 있다가,
+# 파일의 mtime/size가 바뀌었을 때만 다시 읽어오는 데이터셋 저장소
+
+_version_counter = itertools.count(1)
+
+
+class Dataset:
+    def __init__(self, path, data, stamp):
+        self.path = path
+        self.data = data
+        self.stamp = stamp
+        # 파일을 새로 읽을 때마다 증가하는 버전 (캐시 키 등에 사용)
+        self.version = next(_version_counter)
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name, builder):
+        # 인덱스처럼 데이터에서 파생되는 구조는 버전마다 한 번만 만든다
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = builder(self.data)
+            return self._derived[name]
+
+    def read_bytes(self):
+        # 파일 원본 바이트 (파일 그대로 내려주는 응답용)
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def find_by_ids(self, ids):
+        # id -> 항목 인덱스로 요청한 순서대로 찾는다 (중복/없는 id는 건너뜀)
+        index = self.derived('by_id', build_id_index)
+        found = []
+        seen = set()
+        for item_id in ids:
+            try:
+                if item_id in seen:
+                    continue
+                items = index.get(item_id)
+            except TypeError:
+                continue
+            seen.add(item_id)
+            if items:
+                found.extend(items)
+        return found
+
+
+def build_id_index(data):
+    index = {}
+    for item in data:
+        item_id = item.get('id')
+        if item_id is not None:
+            index.setdefault(item_id, []).append(item)
+    return index
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+class DataStore:
+    def __init__(self, data_dir, snapshot=None):
+        self.data_dir = data_dir
+        # snapshot.py 로 만든 바이너리 스냅샷이 있으면 JSON 대신 그것에서 읽는다
+        self.snapshot = snapshot
+        self._datasets = {}
+        self._lock = threading.Lock()
+        # 파일을 (다시) 읽을 때마다 listener(path, 걸린 시간) 을 호출
+        self.listeners = []
+
+    def path(self, *parts):
+        return os.path.join(self.data_dir, *parts)
+
+    def get(self, *parts):
+        # 파일이 없으면 None, 있으면 최신 내용의 Dataset 반환
+        path = self.path(*parts)
+        stamp = _file_stamp(path)
+        if stamp is None:
+            self._datasets.pop(path, None)
+            return None
+
+        current = self._datasets.get(path)
+        if current is not None and current.stamp == stamp:
+            return current
+
+        with self._lock:
+            current = self._datasets.get(path)
+            if current is None or current.stamp != stamp:
+                started = time.perf_counter()
+                found, data = self.snapshot.load(path, stamp) if self.snapshot is not None else (False, None)
+                if not found:
+                    data = _read_json(path)
+                current = Dataset(path, data, stamp)
+                self._datasets[path] = current
+                for listener in self.listeners:
+                    listener(path, time.perf_counter() - started)
+        return current
+
+    def reload(self, *parts):
+        # 인자가 없으면 전체, 있으면 해당 파일만 강제로 다시 읽는다
+        with self._lock:
+            if parts:
+                self._datasets.pop(self.path(*parts), None)
+            else:
+                self._datasets.clear()
+
+    def stamps(self):
+        # 현재 메모리에 올라와 있는 파일별 (mtime, size)
+        return {path: dataset.stamp for path, dataset in self._datasets.items()}
+
+    def preload(self, patterns):
+        # 서버 시작 시 자주 쓰는 파일들을 미리 읽어둔다
+        loaded = []
+        for parts in patterns:
+            directory = self.path(*parts[:-1])
+            if parts[-1] == '*':
+                if not os.path.isdir(directory):
+                    continue
+                names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+                targets = [parts[:-1] + (name,) for name in names]
+            else:
+                targets = [parts]
+            for target in targets:
+                if self.get(*target) is not None:
+                    loaded.append(self.path(*target))
+        return loaded
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right
+
+# 교외 공고 필터용 facet 비트맵 색인
+# 항목 i가 조건을 만족하면 정수 비트맵의 i번째 비트를 켜 두고,
+# 필터는 비트 AND 몇 번으로 계산한다.
+
+ALL = '전체'
+PRE_FOUNDER = '예비창업자'
+
+
+def _bit_positions(mask):
+    # 켜진 비트의 위치를 낮은 자리부터 반환
+    bits = bin(mask)[:1:-1]
+    positions = []
+    position = bits.find('1')
+    while position != -1:
+        positions.append(position)
+        position = bits.find('1', position + 1)
+    return positions
+
+
+def _cumulative(pairs, reverse=False):
+    # (경계값, 비트) 목록을 경계값 순으로 누적한 비트맵 배열
+    grouped = {}
+    for value, bit in pairs:
+        grouped[value] = grouped.get(value, 0) | bit
+    bounds = sorted(grouped, reverse=reverse)
+    masks = []
+    mask = 0
+    for bound in bounds:
+        mask |= grouped[bound]
+        masks.append(mask)
+    if reverse:
+        bounds.reverse()
+        masks.reverse()
+    return bounds, masks
+
+
+class FacetIndex:
+    def __init__(self, items):
+        self.size = len(items)
+        self.all = (1 << self.size) - 1
+        self.supporttype = {}
+        self.region = {}
+        self.posttarget = {}
+        starts = []
+        ends = []
+        for position, item in enumerate(items):
+            bit = 1 << position
+            self.supporttype[item.get('supporttype')] = self.supporttype.get(item.get('supporttype'), 0) | bit
+            self.region[item.get('region')] = self.region.get(item.get('region'), 0) | bit
+            for target in item.get('posttarget') or []:
+                self.posttarget[target] = self.posttarget.get(target, 0) | bit
+            if item.get('agestart') is not None and item.get('ageend') is not None:
+                starts.append((item['agestart'], bit))
+                ends.append((item['ageend'], bit))
+        # agestart <= age 인 항목 / ageend >= age 인 항목의 누적 비트맵
+        self._start_bounds, self._start_masks = _cumulative(starts)
+        self._end_bounds, self._end_masks = _cumulative(ends, reverse=True)
+
+    def equal(self, facet, value):
+        # facet 값이 정확히 value 인 항목
+        try:
+            return getattr(self, facet).get(value, 0)
+        except TypeError:
+            return 0
+
+    def choice(self, facet, value):
+        # 필터 칩 선택값: '전체'는 조건 없음으로 취급
+        if value == ALL:
+            return self.all
+        return self.equal(facet, value)
+
+    def supporttype_contains(self, keywords):
+        # 기존 로직과 같이 supporttype 문자열에 키워드가 포함되는지로 비교
+        if not keywords:
+            return self.all
+        mask = 0
+        for value, bits in self.supporttype.items():
+            if isinstance(value, str) and any(keyword in value for keyword in keywords):
+                mask |= bits
+        return mask
+
+    def age(self, age):
+        # agestart <= age <= ageend 인 항목
+        if age is None:
+            return self.all
+        index = bisect_right(self._start_bounds, age)
+        started = self._start_masks[index - 1] if index else 0
+        index = bisect_left(self._end_bounds, age)
+        not_ended = self._end_masks[index] if index < len(self._end_masks) else 0
+        return started & not_ended
+
+    def filter_mask(self, supporttype=ALL, region=ALL, posttarget=ALL):
+        return (self.choice('supporttype', supporttype) &
+                self.choice('region', region) &
+                self.choice('posttarget', posttarget))
+
+    def filter_counts(self, supporttype=ALL, region=ALL, posttarget=ALL):
+        # 각 칩을 선택했을 때의 결과 개수 (나머지 facet 조건은 유지)
+        masks = {
+            'supporttype': self.choice('supporttype', supporttype),
+            'region': self.choice('region', region),
+            'posttarget': self.choice('posttarget', posttarget),
+        }
+        counts = {}
+        for facet in masks:
+            others = self.all
+            for name, mask in masks.items():
+                if name != facet:
+                    others &= mask
+            facet_counts = {ALL: others.bit_count()}
+            for value, bits in getattr(self, facet).items():
+                # '전체' 칩은 조건 없음을 뜻하므로 값 그대로의 '전체'와 섞지 않는다
+                if value is not None and value != ALL:
+                    facet_counts[value] = (bits & others).bit_count()
+            counts[facet] = facet_counts
+        return counts
+
+    def pre_founder(self, posttarget_bool):
+        # posttarget_bool 이 참이면 예비창업자가 아닌 공고, 거짓이면 예비창업자 공고
+        if posttarget_bool is None:
+            return self.all
+        mask = self.equal('posttarget', PRE_FOUNDER)
+        return self.all & ~mask if posttarget_bool else mask
+
+    def positions(self, mask):
+        return _bit_positions(mask)
+
+
+def build_facet_index(data):
+    return FacetIndex(data)
@@ -0,0 +1,218 @@
+import os, sys, time, threading
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from flask import Response, g, has_request_context, request
+
+# 라우트별 지연시간/응답 크기 히스토그램, 처리 단계(load/filter/sort/serialize)별 소요 시간,
+# 캐시 hit/miss 를 모아서 /metrics 에 Prometheus 텍스트 형식으로 보여준다.
+# 값은 프로세스(워커)별로 집계된다.
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+class SamplingProfiler:
+    # 주기적으로 모든 스레드의 스택을 찍어서 (collapsed stack -> 횟수) 로 모은다
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._samples_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                    frame = frame.f_back
+                with self._samples_lock:
+                    self.samples[';'.join(reversed(stack))] += 1
+
+    def reset(self):
+        with self._samples_lock:
+            self.samples.clear()
+
+    def collapsed(self, limit=200):
+        with self._samples_lock:
+            top = self.samples.most_common(limit)
+        return ''.join(f'{stack} {count}\n' for stack, count in top)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter()  # (route, method, status) -> 횟수
+        self.latency = {}          # (route, method) -> Histogram
+        self.response_bytes = {}   # (route, method) -> Histogram
+        self.spans = {}            # (route, span) -> Histogram
+        self.data_loads = {}       # 파일 종류 -> Histogram
+        self.caches = {}           # 이름 -> hits/misses 속성을 가진 캐시
+        self.profiler = SamplingProfiler()
+
+    def init_app(self, app, store=None):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view, methods=['GET'])
+        # 프로파일러는 스택을 그대로 보여주고 CPU 를 더 쓰므로 SB_PROFILER_ENDPOINT=1 일 때만 연다
+        if os.environ.get('SB_PROFILER_ENDPOINT') == '1':
+            app.add_url_rule('/metrics/profile', 'metrics_profile', self.profile_view, methods=['GET', 'POST'])
+        if store is not None:
+            store.listeners.append(self._on_data_load)
+        if os.environ.get('SB_PROFILER') == '1':
+            self.profiler.start()
+
+    def register_cache(self, name, cache):
+        self.caches[name] = cache
+
+    def _observe(self, table, key, buckets, value):
+        with self._lock:
+            histogram = table.get(key)
+            if histogram is None:
+                histogram = table[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def _route(self):
+        if not has_request_context():
+            return 'background'
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    @contextmanager
+    def span(self, name):
+        # 핸들러 안의 처리 단계 시간을 잰다: with metrics.span('filter'): ...
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe(self.spans, (self._route(), name), LATENCY_BUCKETS, time.perf_counter() - started)
+
+    def _on_data_load(self, path, seconds):
+        kind = os.path.basename(os.path.dirname(path)) if 'oncampus_data' in path else os.path.basename(path)
+        self._observe(self.data_loads, kind, LATENCY_BUCKETS, seconds)
+        if has_request_context():
+            self._observe(self.spans, (self._route(), 'load'), LATENCY_BUCKETS, seconds)
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        key = (self._route(), request.method)
+        self._observe(self.latency, key, LATENCY_BUCKETS, time.perf_counter() - started)
+        size = response.content_length
+        if size is None and not response.is_streamed:
+            size = len(response.get_data())
+        if size is not None:
+            self._observe(self.response_bytes, key, SIZE_BUCKETS, size)
+        with self._lock:
+            self.requests[key + (response.status_code,)] += 1
+        return response
+
+    def _render_histograms(self, lines, name, help_text, table, label_names):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key, histogram in sorted(table.items()):
+            labels = _labels(**dict(zip(label_names, key)))
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines.append('# HELP sb_requests_total Requests by route, method and status')
+            lines.append('# TYPE sb_requests_total counter')
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'sb_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}')
+            self._render_histograms(lines, 'sb_request_duration_seconds', 'Request latency',
+                                    self.latency, ('route', 'method'))
+            self._render_histograms(lines, 'sb_response_bytes', 'Response body size',
+                                    self.response_bytes, ('route', 'method'))
+            self._render_histograms(lines, 'sb_span_duration_seconds', 'Time spent in handler stages',
+                                    self.spans, ('route', 'span'))
+            self._render_histograms(lines, 'sb_data_load_seconds', 'JSON data file (re)load time',
+                                    {(kind,): histogram for kind, histogram in self.data_loads.items()}, ('file',))
+        lines.append('# HELP sb_cache_requests_total Cache lookups by result')
+        lines.append('# TYPE sb_cache_requests_total counter')
+        for name, cache in sorted(self.caches.items()):
+            lines.append(f'sb_cache_requests_total{{{_labels(cache=name, result="hit")}}} {cache.hits}')
+            lines.append(f'sb_cache_requests_total{{{_labels(cache=name, result="miss")}}} {cache.misses}')
+        lines.append('# HELP sb_cache_hit_ratio Cache hits / lookups since start')
+        lines.append('# TYPE sb_cache_hit_ratio gauge')
+        for name, cache in sorted(self.caches.items()):
+            total = cache.hits + cache.misses
+            lines.append(f'sb_cache_hit_ratio{{{_labels(cache=name)}}} {cache.hits / total if total else 0}')
+        lines.append('# HELP sb_cache_coalesced_total Lookups that waited for an identical in-flight request')
+        lines.append('# TYPE sb_cache_coalesced_total counter')
+        for name, cache in sorted(self.caches.items()):
+            if hasattr(cache, 'coalesced'):
+                lines.append(f'sb_cache_coalesced_total{{{_labels(cache=name)}}} {cache.coalesced}')
+        lines.append('# HELP sb_profiler_running Whether the sampling profiler is on')
+        lines.append('# TYPE sb_profiler_running gauge')
+        lines.append(f'sb_profiler_running {int(self.profiler.running)}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    def profile_view(self):
+        # GET 은 결과 조회만. POST ?enable=1 / ?enable=0 으로 켜고 끄고, ?reset=1 로 초기화
+        # 결과는 collapsed stack 형식
+        if request.method == 'POST':
+            enable = request.values.get('enable')
+            if enable == '1':
+                self.profiler.start()
+            elif enable == '0':
+                self.profiler.stop()
+            if request.values.get('reset') == '1':
+                self.profiler.reset()
+        limit = request.args.get('limit', 200, type=int)
+        return Response(self.profiler.collapsed(limit), mimetype='text/plain; charset=utf-8')
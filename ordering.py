@@ -0,0 +1,85 @@
+from array import array
+from bisect import bisect_left
+
+# 정렬 순서를 데이터 버전마다 미리 만들어 두고, 필터 결과는 그 순서 안의 순번(rank) 목록으로 바꿔 둔다.
+# limit/cursor 가 있으면 순번 목록에서 한 페이지만 잘라낸다.
+# cursor 는 정렬 순서 안에서 마지막으로 돌려준 항목의 순번이다.
+
+SORT_KEYS = {
+    'latest': lambda x: (x['startdate'], x['title']),
+    'savedLot': lambda x: (-x['saved'], x['title']),
+}
+
+MAX_LIMIT = 1000
+
+
+def sorted_positions(dataset, sorting):
+    # sorting 순서로 나열한 항목 위치 목록 (정렬 조건이 없으면 파일 순서)
+    key = SORT_KEYS.get(sorting)
+    if key is None:
+        return range(len(dataset.data))
+    return dataset.derived(f'order:{sorting}', lambda data: sorted(range(len(data)), key=lambda i: key(data[i])))
+
+
+def parse_page_params(params):
+    # 요청 값에서 limit, cursor 를 꺼낸다. 잘못된 값이면 ValueError
+    limit = params.get('limit')
+    cursor = params.get('cursor')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("limit must be an integer")
+        if not 0 < limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    if cursor is not None and cursor != '':
+        try:
+            cursor = int(cursor)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if cursor < 0:
+            raise ValueError("Invalid cursor")
+    else:
+        cursor = None
+    return limit, cursor
+
+
+def ordered_ranks(dataset, positions, sorting=None):
+    # 조건에 맞는 항목들의 정렬 순서 안 순번(rank) 목록 (오름차순). 캐시해 두고 페이지만 잘라 쓰는 용도
+    order = sorted_positions(dataset, sorting)
+    if positions is None:
+        return range(len(order))
+    selected = bytearray(len(dataset.data))
+    for position in positions:
+        selected[position] = 1
+    return array('l', [rank for rank, position in enumerate(order) if selected[position]])
+
+
+def _rank_window(ranks, limit, cursor):
+    start = 0 if cursor is None else bisect_left(ranks, cursor + 1)
+    end = len(ranks) if limit is None else start + limit
+    return ranks[start:end], end < len(ranks)
+
+
+def paginate_ranks(dataset, ranks, sorting=None, limit=None, cursor=None):
+    # ordered_ranks 결과에서 한 페이지의 (항목 목록, 다음 페이지 cursor 또는 None) 을 만든다
+    data = dataset.data
+    order = sorted_positions(dataset, sorting)
+    page, has_more = _rank_window(ranks, limit, cursor)
+    items = [data[order[rank]] for rank in page]
+    return items, str(page[-1]) if has_more else None
+
+
+def next_rank_cursor(ranks, limit=None, cursor=None):
+    # paginate_ranks 가 같은 인자로 돌려줄 다음 cursor (스트리밍 응답의 마지막 줄용)
+    page, has_more = _rank_window(ranks, limit, cursor)
+    return str(page[-1]) if has_more else None
+
+
+def iter_ranks(dataset, ranks, sorting=None, limit=None, cursor=None):
+    # paginate_ranks 와 같은 순서로 항목을 하나씩 내보내는 generator (스트리밍 응답용)
+    data = dataset.data
+    order = sorted_positions(dataset, sorting)
+    page, _ = _rank_window(ranks, limit, cursor)
+    for rank in page:
+        yield data[order[rank]]
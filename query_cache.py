@@ -0,0 +1,74 @@
+import time, threading
+from collections import OrderedDict
+
+# 필터/검색 결과 메모이제이션
+# 인기 검색어처럼 같은 조건(type/region/posttarget/supporttype/sorting/keyword)의 요청이 몰리면
+# 조건과 데이터 버전으로 만든 키로 결과를 잠시(ttl 초) 들고 있다가 재사용한다.
+# 같은 키의 요청이 동시에 들어오면 하나만 계산하고 나머지는 그 결과를 기다린다.
+# 값은 프로세스(워커)별로 캐시된다.
+
+
+class _Pending:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QueryCache:
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # 키 -> (만료 시각, 값)
+        self._pending = {}             # 계산 중인 키 -> _Pending
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 다른 요청의 계산 결과를 기다려서 받은 횟수 (hits 에도 포함)
+
+    def get(self, key, compute):
+        try:
+            hash(key)
+        except TypeError:
+            # 리스트 같은 값이 섞인 조건은 캐시하지 않고 바로 계산
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = _Pending()
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.coalesced += 1
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = compute()
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None:
+                    self._entries[key] = (time.monotonic() + self.ttl, pending.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            pending.done.set()
+        return pending.value
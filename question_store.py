@@ -0,0 +1,93 @@
+import os, sys, json
+from sqlite_store import SQLiteStore
+
+# 공고별 Q&A 질문 저장소 (SQLite)
+# 질문은 추가만 하고(append-only), 공고 안에서의 일련번호(seq)를 트랜잭션 안에서 할당한다.
+# qid 에는 unique 인덱스를 두어 /questionbyqid 조회를 바로 찾는다.
+# 처음 열 때 기존 {공고id}q.json 파일들을 한 번만 옮겨온다.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    question_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    qid TEXT NOT NULL UNIQUE,
+    body TEXT NOT NULL,
+    PRIMARY KEY (question_id, seq)
+);
+CREATE TABLE IF NOT EXISTS migrated_files (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+def _qid_seq(qid):
+    # '12401020001q003' -> 3
+    return int(qid.rsplit('q', 1)[1])
+
+
+class QuestionRepository(SQLiteStore):
+    schema = SCHEMA
+
+    def __init__(self, db_path, legacy_dir=None):
+        super().__init__(db_path)
+        if legacy_dir:
+            self._migrate_json_files(legacy_dir)
+
+    def _migrate_json_files(self, legacy_dir):
+        if not os.path.isdir(legacy_dir):
+            return
+        for name in sorted(os.listdir(legacy_dir)):
+            if not name.endswith('q.json'):
+                continue
+            question_id = name[:-len('q.json')]
+            with self._transaction() as conn:
+                if conn.execute("SELECT 1 FROM migrated_files WHERE name = ?", (name,)).fetchone():
+                    continue
+                # 동시 쓰기로 깨진 파일이 있어도 서버 시작은 계속한다.
+                # 완료 표시를 남기지 않으므로 파일을 고친 뒤 다시 시작하면 옮겨온다
+                try:
+                    with open(os.path.join(legacy_dir, name), 'r', encoding='utf-8') as file:
+                        questions = json.load(file)
+                    rows = [(question_id, _qid_seq(item['qid']), item['qid'], json.dumps(item, ensure_ascii=False))
+                            for item in questions]
+                except (OSError, ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                    print(f'[question_store] skipping {name}: {e!r}', file=sys.stderr)
+                    continue
+                conn.executemany(
+                    "INSERT OR IGNORE INTO questions (question_id, seq, qid, body) VALUES (?, ?, ?, ?)", rows)
+                conn.execute("INSERT INTO migrated_files (name) VALUES (?)", (name,))
+
+    def append(self, question_id, build_question):
+        # 다음 qid 를 할당하고 build_question(qid) 로 만든 질문을 추가한다
+        with self._transaction() as conn:
+            row = conn.execute("SELECT MAX(seq) FROM questions WHERE question_id = ?", (question_id,)).fetchone()
+            seq = (row[0] or 0) + 1
+            qid = f'{question_id}q{seq:03d}'
+            question = build_question(qid)
+            conn.execute("INSERT INTO questions (question_id, seq, qid, body) VALUES (?, ?, ?, ?)",
+                         (question_id, seq, qid, json.dumps(question, ensure_ascii=False)))
+        return question
+
+    def list(self, question_id, limit=None, cursor=None):
+        # 작성 순서대로 반환. cursor 는 이전 페이지 마지막 질문의 seq
+        # 반환값: (질문 목록, 다음 페이지 cursor 또는 None)
+        query = "SELECT seq, body FROM questions WHERE question_id = ? AND seq > ? ORDER BY seq"
+        params = [question_id, cursor or 0]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+        rows = self._connection().execute(query, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1][0])
+        return [json.loads(body) for _, body in rows], next_cursor
+
+    def exists(self, question_id):
+        row = self._connection().execute(
+            "SELECT 1 FROM questions WHERE question_id = ? LIMIT 1", (question_id,)).fetchone()
+        return row is not None
+
+    def get(self, qid):
+        row = self._connection().execute("SELECT body FROM questions WHERE qid = ?", (qid,)).fetchone()
+        return json.loads(row[0]) if row else None
@@ -0,0 +1,73 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+# 로드맵 추천용 후보 풀
+# 데이터 버전마다 type 별 후보 목록을 한 번만 만들어 두고, 요청 시에는 전체 후보를 다시 모으지 않고
+# 풀 크기의 누적합에서 위치를 골라 O(1)(k개면 O(k log 풀 수))로 뽑는다.
+
+MAX_COUNT = 100
+
+
+class TypePools:
+    def __init__(self, items, key='type'):
+        self.pools = {}
+        for item in items:
+            try:
+                self.pools.setdefault(item.get(key), []).append(item)
+            except TypeError:
+                continue
+
+    def select(self, types):
+        # 요청한 type 들의 풀 (중복 제거, 빈 풀 제외)
+        pools = []
+        seen = set()
+        for value in types:
+            try:
+                if value in seen:
+                    continue
+                pool = self.pools.get(value)
+            except TypeError:
+                continue
+            seen.add(value)
+            if pool:
+                pools.append(pool)
+        return pools
+
+
+def build_type_pools(data):
+    return TypePools(data)
+
+
+def parse_sample_params(params):
+    # count(한 번에 받을 추천 개수), seed(재현 가능한 결과용) 를 꺼낸다. 잘못된 값이면 ValueError
+    count = params.get('count')
+    if count is not None:
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            raise ValueError("count must be an integer")
+        if not 0 < count <= MAX_COUNT:
+            raise ValueError(f"count must be between 1 and {MAX_COUNT}")
+    seed = params.get('seed')
+    if seed is None:
+        rng = random
+    elif isinstance(seed, (int, float, str)) and not isinstance(seed, bool):
+        rng = random.Random(seed)
+    else:
+        raise ValueError("seed must be a number or a string")
+    return count, rng
+
+
+def sample(pools, k, rng=random):
+    # 여러 풀을 이어붙인 것처럼 보고 서로 다른 항목 k개를 균등하게 뽑는다
+    sizes = list(accumulate(len(pool) for pool in pools))
+    total = sizes[-1] if sizes else 0
+    if total == 0:
+        return []
+    picked = []
+    for index in rng.sample(range(total), min(k, total)):
+        pool_index = bisect_right(sizes, index)
+        offset = index - (sizes[pool_index - 1] if pool_index else 0)
+        picked.append(pools[pool_index][offset])
+    return picked
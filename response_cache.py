@@ -0,0 +1,77 @@
+import gzip, hashlib, threading
+from collections import OrderedDict
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 만 사용
+    brotli = None
+
+# 전체 목록처럼 매번 같은 내용을 직렬화하는 응답을 바이트로 캐시해 둔다.
+# 압축본(gzip/br)과 ETag 를 함께 보관하고, 데이터 버전이 바뀌면 다시 만든다.
+
+JSON_MIMETYPE = 'application/json; charset=utf-8'
+
+
+class CachedBody:
+    def __init__(self, version, body, mimetype):
+        self.version = version
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, 6, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body)
+
+    def variant_etag(self, encoding):
+        return self.etag if encoding == 'identity' else f'{self.etag}-{encoding}'
+
+    def choose_encoding(self, accept_encodings):
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return 'identity'
+
+    def to_response(self, cache_control='no-cache'):
+        encoding = self.choose_encoding(request.accept_encodings)
+        etag = self.variant_etag(encoding)
+        etags = [self.variant_etag(name) for name in self.variants]
+        if any(request.if_none_match.contains(tag) for tag in etags):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+
+class ResponseCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build, mimetype=JSON_MIMETYPE):
+        # version 은 데이터셋 버전: 파일이 다시 로드되면 항목도 새로 만든다
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = CachedBody(version, build(), mimetype)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def response(self, key, version, build, mimetype=JSON_MIMETYPE):
+        return self.get(key, version, build, mimetype).to_response()
@@ -0,0 +1,58 @@
+# 공고 제목/내용 키워드 검색용 역색인
+# 한글은 띄어쓰기로 단어를 나누기 어려워서 글자 단위 n-gram(1, 2글자)으로 색인하고,
+# 후보를 추린 뒤 기존과 같은 부분 문자열 비교로 최종 확인한다.
+
+SEARCH_FIELDS = ('title', 'content')
+GRAM_SIZE = 2
+
+
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class SearchIndex:
+    def __init__(self, items, fields=SEARCH_FIELDS):
+        # 항목별로 소문자로 바꾼 필드 값을 들고 있다가 최종 확인에 사용
+        self.texts = [tuple(str(item.get(field) or '').lower() for field in fields) for item in items]
+        self.postings = {}
+        for position, texts in enumerate(self.texts):
+            grams = set()
+            for text in texts:
+                grams |= _grams(text, 1)
+                grams |= _grams(text, GRAM_SIZE)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def search(self, keyword):
+        # 키워드가 포함된 항목의 위치를 원래 순서대로 반환
+        keyword = (keyword or '').lower()
+        if not keyword:
+            return range(len(self.texts))
+
+        size = 1 if len(keyword) == 1 else GRAM_SIZE
+        query_grams = _grams(keyword, size)
+        postings = []
+        for gram in query_grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        return [position for position in sorted(candidates)
+                if any(keyword in text for text in self.texts[position])]
+
+
+def build_search_index(data):
+    return SearchIndex(data)
+
+
+def search_positions(dataset, keyword):
+    # Dataset 버전마다 색인을 한 번만 만들고 키워드에 맞는 항목 위치를 돌려준다
+    return dataset.derived('search', build_search_index).search(keyword)
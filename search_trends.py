@@ -0,0 +1,179 @@
+import os, sys, json, time, threading
+from collections import Counter, deque
+
+try:
+    import fcntl
+except ImportError:  # fcntl 이 없는 환경(Windows)은 한 프로세스로만 실행한다고 보고 파일 잠금 생략
+    fcntl = None
+
+# 실제 검색어로 인기 검색어 파일을 갱신하는 집계
+# 검색 요청은 검색어를 deque 에 넣기만 하고(잠금 없음), 백그라운드 스레드가 interval 초마다 모아서
+# 범위(교외 'offcampus', 교내는 학교 번호)별 Space-Saving top-K 에 더한다.
+# 오래된 검색어는 half_life 초마다 절반으로 줄어들어 최근 유행하는 검색어가 위로 올라온다.
+# 워커 여러 개가 같은 상태 파일(system_data/search_trends.json)에 잠금을 잡고 합쳐 쓰고,
+# 상위 검색어를 offcampus_data/popular_search.json, oncampus_data/popular_search/<no>.json 에 쓴다.
+
+MAX_KEYWORD_LENGTH = 50
+MIN_COUNT = 0.01
+# 인기 검색어에 오르려면 (감소를 반영한) 최소 이 정도는 검색되어야 한다. 요청 한두 번으로 목록을 바꿀 수 없게 함
+MIN_SUPPORT = 5
+
+
+class TopK:
+    # Space-Saving: 최대 capacity 개의 검색어만 세고, 자리가 없으면 가장 작은 항목을 내보내고 그 값을 이어받는다
+    # counts: 검색어 -> [횟수, 오차]. 오차는 내보낸 항목에게서 이어받은 값이라 실제 검색 횟수는 횟수 - 오차 이상이다
+    def __init__(self, capacity, counts=None):
+        self.capacity = capacity
+        self.counts = {term: list(value) for term, value in (counts or {}).items()
+                       if isinstance(value, list) and len(value) == 2}
+
+    def add(self, term, weight=1.0):
+        if term in self.counts:
+            self.counts[term][0] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = [weight, 0.0]
+        else:
+            smallest = min(self.counts, key=lambda key: self.counts[key][0])
+            inherited = self.counts.pop(smallest)[0]
+            self.counts[term] = [inherited + weight, inherited]
+
+    def decay(self, factor):
+        self.counts = {term: [count * factor, error * factor] for term, (count, error) in self.counts.items()
+                       if count * factor >= MIN_COUNT}
+
+    def top(self, k, min_support=0):
+        # 확실히 min_support 번 이상 검색된 것만 많은 순으로
+        supported = [(term, count) for term, (count, error) in self.counts.items() if count - error >= min_support]
+        return [term for term, _ in sorted(supported, key=lambda pair: (-pair[1], pair[0]))[:k]]
+
+
+class SearchTrends:
+    def __init__(self, data_dir, interval=300, half_life=86400, capacity=200, top_k=6, max_pending=100000,
+                 min_support=MIN_SUPPORT):
+        self.data_dir = data_dir
+        self.state_path = os.path.join(data_dir, 'system_data', 'search_trends.json')
+        self.interval = interval
+        self.half_life = half_life
+        self.capacity = capacity
+        self.top_k = top_k
+        self.min_support = min_support
+        self._pending = deque(maxlen=max_pending)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # fork 된 워커는 부모의 스레드가 없으므로 처음 기록할 때 다시 시작한다
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        self._pending = deque(maxlen=self._pending.maxlen)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(self, scope, keyword):
+        # 검색 요청 처리 중에 호출: 큐에 넣기만 하고 바로 돌아간다
+        if self.interval <= 0 or not isinstance(keyword, str):
+            return
+        keyword = ' '.join(keyword.split())
+        if not keyword or len(keyword) > MAX_KEYWORD_LENGTH:
+            return
+        self._pending.append((str(scope), keyword))
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-trends', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f'[search_trends] flush failed: {e}', file=sys.stderr)
+
+    def popular_path(self, scope):
+        if scope == 'offcampus':
+            return os.path.join(self.data_dir, 'offcampus_data', 'popular_search.json')
+        return os.path.join(self.data_dir, 'oncampus_data', 'popular_search', f'{scope}.json')
+
+    def flush(self):
+        # 쌓인 검색어를 상태 파일에 합치고 인기 검색어 파일을 다시 쓴다. 반환값: 새로 쓴 인기 검색어 파일 수
+        with self._flush_lock:
+            batch = {}
+            while True:
+                try:
+                    scope, keyword = self._pending.popleft()
+                except IndexError:
+                    break
+                batch.setdefault(scope, Counter())[keyword] += 1
+            if not batch:
+                return 0
+
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(self.state_path + '.lock', 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                state = self._load_state()
+                now = time.time()
+                factor = 0.5 ** (max(now - state.get('updated', now), 0) / self.half_life)
+                scopes = {scope: TopK(self.capacity, counts) for scope, counts in state.get('scopes', {}).items()}
+                for sketch in scopes.values():
+                    sketch.decay(factor)
+                for scope, counts in batch.items():
+                    sketch = scopes.setdefault(scope, TopK(self.capacity))
+                    for keyword, count in counts.most_common():
+                        sketch.add(keyword, count)
+                self._write_json(self.state_path, {
+                    'updated': now,
+                    'scopes': {scope: sketch.counts for scope, sketch in scopes.items()},
+                })
+                written = 0
+                for scope in batch:
+                    if self._write_popular(scope, scopes[scope].top(self.top_k, self.min_support)):
+                        written += 1
+                return written
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_list(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, list) else None
+
+    def _write_popular(self, scope, terms):
+        path = self.popular_path(scope)
+        current = self._read_list(path)
+        if current is None and scope != 'offcampus':
+            # 학교별 파일이 아직 없으면 교내 공통 인기 검색어를 기준으로 삼는다
+            current = self._read_list(os.path.join(self.data_dir, 'oncampus_data', 'onca_popular_search.json'))
+        current = current or []
+        # 충분히 검색된 검색어가 아직 적으면 기존 목록으로 나머지 자리를 채운다
+        for term in current:
+            if len(terms) >= self.top_k:
+                break
+            if term not in terms:
+                terms.append(term)
+        if terms == current:
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write_json(path, terms, indent=4)
+        return True
+
+    def _write_json(self, path, data, indent=None):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
@@ -0,0 +1,176 @@
+import os, sys, time, signal, socket, argparse, threading
+from werkzeug.serving import make_server, WSGIRequestHandler
+from app import app, store, logo_assets, search_trends, PRELOAD_PATTERNS
+
+# 운영용 실행 스크립트
+#   python serve.py --workers 4 --port 5002
+# 마스터 프로세스가 데이터를 미리 읽어 둔 뒤 워커를 fork 하므로, 워커들은 같은 메모리를
+# copy-on-write 로 공유한다. 마스터는 data/ 파일 변경을 감시하다가 바뀌면 데이터를 다시 읽고
+# 새 워커를 띄운 뒤 기존 워커를 처리 중인 요청이 끝나면 종료시킨다. (SIGHUP 으로도 가능)
+#
+# ASGI 서버(uvicorn 등)로 띄우려면 asgiref 를 설치하고
+#   uvicorn serve:asgi_app
+# 처럼 asgi_app 을 사용한다.
+
+
+def create_asgi_app():
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+    except ImportError:
+        raise RuntimeError("ASGI mode requires the 'asgiref' package (pip install asgiref)")
+    return WsgiToAsgi(app)
+
+
+def __getattr__(name):
+    # serve:asgi_app 으로 참조할 때만 asgiref 를 불러온다
+    if name == 'asgi_app':
+        return create_asgi_app()
+    raise AttributeError(name)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Starting Block server (multi-worker)')
+    parser.add_argument('--host', default=os.environ.get('SB_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SB_PORT', 5002)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SB_WORKERS', os.cpu_count() or 1)))
+    parser.add_argument('--backlog', type=int, default=int(os.environ.get('SB_BACKLOG', 2048)))
+    parser.add_argument('--keepalive', type=float, default=float(os.environ.get('SB_KEEPALIVE', 5)),
+                        help='idle keep-alive connection timeout in seconds')
+    parser.add_argument('--reload-interval', type=float, default=float(os.environ.get('SB_RELOAD_INTERVAL', 5)),
+                        help='seconds between data/ change checks (0 to disable)')
+    return parser.parse_args(argv)
+
+
+def run_worker(listen_socket, options):
+    class RequestHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        timeout = options.keepalive
+
+    server = make_server(options.host, options.port, app, threaded=True,
+                         request_handler=RequestHandler, fd=listen_socket.fileno())
+    # 종료할 때 처리 중인 요청 스레드가 끝날 때까지 기다린다
+    server.daemon_threads = False
+    server.block_on_close = True
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    server.serve_forever()
+    server.server_close()
+    # 아직 반영하지 않은 검색어를 남기고 종료
+    search_trends.flush()
+
+
+class Master:
+    def __init__(self, options):
+        self.options = options
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self.stopping = False
+        self.reload_requested = False
+        self.listen_socket = socket.create_server((options.host, options.port), backlog=options.backlog)
+        self.listen_socket.set_inheritable(True)
+        # 워커들이 같은 소켓을 select 한 뒤 accept 하므로, 연결 하나에 여러 워커가 깨어나면 진 쪽이
+        # accept 에서 멈춰 종료 신호를 못 보게 된다. non-blocking 이면 그냥 돌아가서 다시 select 한다
+        self.listen_socket.setblocking(False)
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.listen_socket, self.options)
+            except BaseException:
+                code = 1
+                import traceback
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        self.workers[pid] = self.generation
+
+    def reload(self):
+        # 데이터를 마스터에서 다시 읽고 새 세대 워커로 교체
+        self.generation += 1
+        store.preload(PRELOAD_PATTERNS)
+        old = [pid for pid, generation in self.workers.items() if generation != self.generation]
+        for _ in range(self.options.workers):
+            self.spawn()
+        for pid in old:
+            self._kill(pid, signal.SIGTERM)
+        print(f'[master] reloaded data, generation {self.generation}', file=sys.stderr)
+
+    def data_changed(self):
+        before = store.stamps()
+        store.preload(PRELOAD_PATTERNS)
+        changed = store.stamps() != before
+        # 로고(svg)는 DataStore 밖에서 읽으므로 따로 확인한다
+        if logo_assets.changed():
+            logo_assets.reload()
+            changed = True
+        return changed
+
+    def reap(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation = self.workers.pop(pid, None)
+            # 현재 세대 워커가 예기치 않게 죽었으면 다시 띄운다
+            if not self.stopping and generation == self.generation:
+                self.spawn()
+
+    def _kill(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, 'reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, 'stopping', True))
+        signal.signal(signal.SIGINT, lambda signum, frame: setattr(self, 'stopping', True))
+
+        print(f'[master] listening on {self.options.host}:{self.options.port} '
+              f'with {self.options.workers} workers', file=sys.stderr)
+        for _ in range(self.options.workers):
+            self.spawn()
+
+        last_check = time.monotonic()
+        while not self.stopping:
+            time.sleep(0.5)
+            self.reap()
+            interval = self.options.reload_interval
+            if self.reload_requested or (interval > 0 and time.monotonic() - last_check >= interval):
+                last_check = time.monotonic()
+                if self.reload_requested:
+                    # SIGHUP 은 변경 여부와 상관없이 모든 파일을 다시 읽는다
+                    self.reload_requested = False
+                    store.reload()
+                    logo_assets.reload()
+                    self.reload()
+                elif self.data_changed():
+                    self.reload()
+
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGTERM)
+        while self.workers:
+            try:
+                pid, _ = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            self.workers.pop(pid, None)
+        self.listen_socket.close()
+
+
+def main(argv=None):
+    Master(parse_args(argv)).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import os, sys, json, mmap, pickle, struct, argparse
+
+# data/ 의 JSON 파일들을 하나의 바이너리 스냅샷 파일로 미리 변환해 두는 빌드 단계
+#   python snapshot.py build            (기본 출력: data/snapshot.bin)
+# 같은 문자열(키, type/region 값 등)은 한 객체로 합쳐(intern) 저장하므로 파일과 메모리가 줄고,
+# 서버는 시작할 때 스냅샷을 mmap 으로 열어 JSON 파싱 대신 pickle 로 바로 복원한다.
+# 복원한 데이터는 프로세스마다 따로 만들어지는 일반 파이썬 객체다. (mmap 으로 공유되는 것은 pickle 바이트뿐)
+# serve.py 에서 워커끼리 데이터를 나눠 쓰는 것은 마스터가 미리 읽은 뒤 fork 하기 때문이고,
+# uvicorn --workers N 처럼 프로세스마다 따로 import 하면 각자 한 벌씩 복원한다.
+# 원본 JSON 의 mtime/size 가 스냅샷을 만들 때와 다르면 그 파일은 JSON 으로 다시 읽는다.
+
+MAGIC = b'SBSNAP01'
+HEADER = struct.Struct('<8sQ')
+DEFAULT_NAME = 'snapshot.bin'
+SKIP_DIRS = ('system_data',)
+
+
+def _intern(value, table):
+    if isinstance(value, str):
+        return table.setdefault(value, value)
+    if isinstance(value, list):
+        return [_intern(item, table) for item in value]
+    if isinstance(value, dict):
+        return {table.setdefault(key, key): _intern(item, table) for key, item in value.items()}
+    return value
+
+
+def _json_files(data_dir):
+    for root, dirs, files in os.walk(data_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if name.endswith('.json'):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, data_dir).replace(os.sep, '/'), path
+
+
+def build(data_dir, out_path=None):
+    # 반환값: 스냅샷에 담긴 파일 수
+    out_path = out_path or os.path.join(data_dir, DEFAULT_NAME)
+    strings = {}
+    index = {}
+    blobs = []
+    offset = 0
+    for name, path in _json_files(data_dir):
+        st = os.stat(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            data = _intern(json.load(file), strings)
+        blob = pickle.dumps(data, protocol=5)
+        index[name] = [offset, len(blob), st.st_mtime_ns, st.st_size]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps(index, ensure_ascii=False).encode('utf-8')
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(tmp_path, out_path)
+    return len(index)
+
+
+class Snapshot:
+    def __init__(self, path, data_dir):
+        self.path = path
+        self.data_dir = data_dir
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a data snapshot')
+        start = HEADER.size
+        self.index = json.loads(self._mmap[start:start + header_size].decode('utf-8'))
+        self._base = start + header_size
+
+    @classmethod
+    def open_if_exists(cls, path, data_dir):
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path, data_dir)
+        except (OSError, ValueError, struct.error) as e:
+            print(f'[snapshot] ignoring {path}: {e}', file=sys.stderr)
+            return None
+
+    def load(self, path, stamp):
+        # 스냅샷에 같은 버전의 파일이 있으면 (True, 데이터), 없으면 (False, None)
+        name = os.path.relpath(path, self.data_dir).replace(os.sep, '/')
+        entry = self.index.get(name)
+        if entry is None or (entry[2], entry[3]) != stamp:
+            return False, None
+        offset, length = self._base + entry[0], entry[1]
+        with memoryview(self._mmap)[offset:offset + length] as blob:
+            return True, pickle.loads(blob)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile data/ JSON files into a binary snapshot')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--data-dir', default=os.environ.get(
+        'SB_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')))
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+    count = build(args.data_dir, args.output)
+    print(f'wrote {count} files to {args.output or os.path.join(args.data_dir, DEFAULT_NAME)}')
+
+
+if __name__ == '__main__':
+    main()
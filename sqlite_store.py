@@ -0,0 +1,49 @@
+import os, sqlite3, threading
+
+# SQLite 저장소 공통 부분
+# 스레드마다 연결을 따로 열고(WAL 모드), 쓰기는 BEGIN IMMEDIATE 트랜잭션으로 처리한다.
+
+
+class SQLiteStore:
+    schema = ''
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connection().executescript(self.schema)
+        # fork 된 워커가 부모 프로세스의 연결을 이어 쓰지 않도록 새로 연다
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_connections)
+
+    def _reset_connections(self):
+        self._local = threading.local()
+
+    def _connection(self):
+        # sqlite3 연결은 스레드마다 따로 연다
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡아서 읽고-쓰기 사이에 끼어드는 요청이 없도록 한다
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+        return False
@@ -0,0 +1,125 @@
+import os, sys, json, sqlite3
+from datetime import datetime
+from sqlite_store import SQLiteStore
+
+# 사용자 정보 저장소 (SQLite, WAL 모드)
+# uuid, kakaoUserID, nickname 에 unique 인덱스를 두고,
+# 생성/수정은 트랜잭션 안에서 처리해서 동시에 가입해도 값이 유실되지 않는다.
+# 처음 열 때 기존 user_info.json 내용을 한 번만 옮겨온다.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    uuid TEXT PRIMARY KEY,
+    nickname TEXT,
+    kakaoUserID
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_kakao_user_id ON users (kakaoUserID);
+CREATE UNIQUE INDEX IF NOT EXISTS users_nickname ON users (nickname);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class NicknameTaken(Exception):
+    pass
+
+
+def _log(message):
+    print(f'[user_store] {message}', file=sys.stderr)
+
+
+class UserRepository(SQLiteStore):
+    schema = SCHEMA
+
+    def __init__(self, db_path, legacy_json_path=None):
+        super().__init__(db_path)
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    def _migrate_json(self, json_path):
+        # 기존 파일의 uuid/닉네임이 겹치거나 형식이 잘못되어도 서버 시작을 막지 않도록, 문제 있는 행은 고치거나 건너뛰고 로그를 남긴다
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+                return
+            if os.path.exists(json_path) and os.stat(json_path).st_size != 0:
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as file:
+                        users = json.load(file).get('users', [])
+                except (OSError, ValueError, AttributeError) as e:
+                    # 완료 표시를 남기지 않으므로 파일을 고친 뒤 다시 시작하면 옮겨온다
+                    _log(f'cannot read {json_path}, skipping migration: {e}')
+                    return
+                for user in users:
+                    self._migrate_user(conn, user)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (json_path,))
+
+    def _migrate_user(self, conn, user):
+        if not isinstance(user, dict):
+            _log(f'skipping malformed user entry: {user!r}')
+            return
+        kakao_user_id = user.get('kakaoUserID')
+        nickname = user.get('nickname')
+        user_uuid = user.get('uuid')
+        try:
+            if kakao_user_id is not None and conn.execute(
+                    "SELECT 1 FROM users WHERE kakaoUserID = ?", (kakao_user_id,)).fetchone():
+                _log(f'skipping user {user_uuid!r}: kakaoUserID {kakao_user_id!r} already migrated')
+                return
+            # 예전 len(users)+1 방식으로 겹친 uuid 는 새로 발급
+            if user_uuid is None or conn.execute("SELECT 1 FROM users WHERE uuid = ?", (user_uuid,)).fetchone():
+                new_uuid = self._next_uuid(conn)
+                _log(f'user {user_uuid!r} (kakaoUserID {kakao_user_id!r}): missing or duplicate uuid, reissued as {new_uuid}')
+                user_uuid = new_uuid
+            # 기존에는 닉네임 중복을 막지 않았으므로 겹치면 번호를 붙인다
+            if nickname is not None and conn.execute(
+                    "SELECT 1 FROM users WHERE nickname = ?", (nickname,)).fetchone():
+                suffix = 2
+                while conn.execute("SELECT 1 FROM users WHERE nickname = ?", (f'{nickname}{suffix}',)).fetchone():
+                    suffix += 1
+                renamed = f'{nickname}{suffix}'
+                _log(f'user {user_uuid!r}: duplicate nickname {nickname!r}, renamed to {renamed!r}')
+                nickname = renamed
+            conn.execute("INSERT INTO users (uuid, nickname, kakaoUserID) VALUES (?, ?, ?)",
+                         (user_uuid, nickname, kakao_user_id))
+        except sqlite3.Error as e:
+            # 값의 형식이 잘못된 경우 등: 해당 사용자만 건너뛴다
+            _log(f'skipping user {user_uuid!r}: {e}')
+
+    def is_nickname_available(self, nickname):
+        row = self._connection().execute("SELECT 1 FROM users WHERE nickname = ?", (nickname,)).fetchone()
+        return row is None
+
+    def upsert(self, kakao_user_id, nickname):
+        # kakaoUserID 가 있으면 닉네임만 바꾸고, 없으면 새 uuid 로 추가. uuid 반환
+        try:
+            with self._transaction() as conn:
+                row = conn.execute("SELECT uuid FROM users WHERE kakaoUserID = ?", (kakao_user_id,)).fetchone()
+                if row:
+                    conn.execute("UPDATE users SET nickname = ? WHERE uuid = ?", (nickname, row[0]))
+                    return row[0]
+                user_uuid = self._next_uuid(conn)
+                conn.execute("INSERT INTO users (uuid, nickname, kakaoUserID) VALUES (?, ?, ?)",
+                             (user_uuid, nickname, kakao_user_id))
+                return user_uuid
+        except sqlite3.IntegrityError:
+            raise NicknameTaken(nickname)
+
+    def change_nickname(self, user_uuid, nickname):
+        # 사용자가 없으면 False
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute("UPDATE users SET nickname = ? WHERE uuid = ?", (nickname, user_uuid))
+                return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            raise NicknameTaken(nickname)
+
+    def _next_uuid(self, conn):
+        # 날짜(yymmdd) + 그날의 일련번호(3자리 이상)
+        prefix = datetime.now().strftime('%y%m%d')
+        row = conn.execute(
+            "SELECT MAX(CAST(substr(uuid, 7) AS INTEGER)) FROM users WHERE uuid LIKE ? AND length(uuid) > 6",
+            (prefix + '%',)).fetchone()
+        return f"{prefix}{(row[0] or 0) + 1:03d}"
+